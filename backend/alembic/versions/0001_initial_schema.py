@@ -13,19 +13,65 @@ branch_labels: Sequence[str] | None = None
 depends_on: Sequence[str] | None = None
 
 
-def _enable_rls(table: str) -> None:
-    policy = f"{table}_tenant_isolation"
-    clause = "current_setting('app.current_tenant', true) IS NOT NULL AND tenant_id = current_setting('app.current_tenant')::uuid"
-    op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
-    op.execute(f"ALTER TABLE {table} FORCE ROW LEVEL SECURITY")
+def _policy_names(table: str) -> tuple[str, ...]:
+    """Canonical tenant policy names, including per-command variants."""
+
+    return (
+        f"{table}_tenant_isolation",
+        *(f"{table}_tenant_{cmd}" for cmd in ("select", "insert", "update", "delete")),
+    )
+
+
+# The scalar subselect is planned as an InitPlan, so the GUC lookup and uuid
+# cast run once per query instead of once per row.
+TENANT_CLAUSE = "tenant_id = (SELECT current_setting('app.current_tenant', true)::uuid)"
+
+
+def _sql_array(values: Sequence[str]) -> str:
+    return "ARRAY[" + ", ".join(f"'{value}'" for value in values) + "]"
+
+
+def _enable_rls(*tables: str) -> None:
+    """Install exactly one permissive ``FOR ALL`` tenant policy per table.
+
+    PostgreSQL evaluates every applicable permissive policy for each row, so
+    the tenant rule must stay a single policy covering all commands. Extra
+    conditions belong in this policy as ``USING (cond1 OR cond2)`` rather than
+    in additional per-command policies.
+
+    All tables are handled by one anonymous block, i.e. a single statement.
+    """
+
+    clause = TENANT_CLAUSE.replace("'", "''")
     op.execute(
-        f"CREATE POLICY {policy} ON {table} USING ({clause}) WITH CHECK ({clause})"
+        f"""
+DO $$
+DECLARE
+    t text;
+BEGIN
+    FOREACH t IN ARRAY {_sql_array(tables)} LOOP
+        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', t);
+        EXECUTE format('ALTER TABLE %I FORCE ROW LEVEL SECURITY', t);
+        EXECUTE format(
+            'CREATE POLICY %I ON %I AS PERMISSIVE FOR ALL USING ({clause}) WITH CHECK ({clause})',
+            t || '_tenant_isolation',
+            t
+        );
+    END LOOP;
+END
+$$
+"""
     )
 
 
-def _disable_rls(table: str) -> None:
-    policy = f"{table}_tenant_isolation"
-    op.execute(f"DROP POLICY IF EXISTS {policy} ON {table}")
+def _disable_rls(*tables: str) -> None:
+    op.execute(
+        ";\n".join(
+            f"DROP POLICY IF EXISTS {policy} ON {table}"
+            for table in tables
+            for policy in _policy_names(table)
+        )
+    )
 
 
 def upgrade() -> None:  # noqa: D401
@@ -139,15 +185,13 @@ def upgrade() -> None:  # noqa: D401
     )
     op.create_index("ix_attachments_tenant", "attachments", ["tenant_id"])
 
-    for table in ("workspaces", "users", "objectives", "key_results", "attachments"):
-        _enable_rls(table)
+    _enable_rls("workspaces", "users", "objectives", "key_results", "attachments")
 
 
 def downgrade() -> None:  # noqa: D401
     """Drop the initial schema."""
 
-    for table in ("attachments", "key_results", "objectives", "users", "workspaces"):
-        _disable_rls(table)
+    _disable_rls("attachments", "key_results", "objectives", "users", "workspaces")
 
     op.drop_index("ix_attachments_tenant", table_name="attachments")
     op.drop_table("attachments")
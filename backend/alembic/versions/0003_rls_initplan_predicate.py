@@ -0,0 +1,32 @@
+"""Evaluate the tenant RLS predicate once per query."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0003_rls_initplan_predicate"
+down_revision: str | None = "0002_add_data_selection_logs"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+TENANT_TABLES = ("workspaces", "users", "objectives", "key_results", "attachments")
+
+CLAUSE = "tenant_id = (SELECT current_setting('app.current_tenant', true)::uuid)"
+LEGACY_CLAUSE = (
+    "current_setting('app.current_tenant', true) IS NOT NULL "
+    "AND tenant_id = current_setting('app.current_tenant')::uuid"
+)
+
+
+def _alter_policies(clause: str) -> None:
+    for table in TENANT_TABLES:
+        op.execute(
+            f"ALTER POLICY {table}_tenant_isolation ON {table} USING ({clause}) WITH CHECK ({clause})"
+        )
+
+
+def upgrade() -> None:
+    _alter_policies(CLAUSE)
+
+
+def downgrade() -> None:
+    _alter_policies(LEGACY_CLAUSE)
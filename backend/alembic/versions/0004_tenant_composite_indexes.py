@@ -0,0 +1,46 @@
+"""Add composite indexes leading with tenant_id to back the RLS filter."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0004_tenant_composite_indexes"
+down_revision: str | None = "0003_rls_initplan_predicate"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# (index name, table, columns). tenant_id always comes first so tenant-wide
+# scans (offboarding, analytics) can still use the index.
+COMPOSITE_INDEXES = (
+    ("ix_users_tenant_id_id", "users", ["tenant_id", "id"]),
+    ("ix_users_tenant_workspace", "users", ["tenant_id", "workspace_id"]),
+    ("ix_objectives_tenant_workspace_due", "objectives", ["tenant_id", "workspace_id", "due_date"]),
+    ("ix_key_results_tenant_objective", "key_results", ["tenant_id", "objective_id"]),
+    ("ix_attachments_tenant_kr", "attachments", ["tenant_id", "key_result_id"]),
+)
+
+# Single-column indexes that are strict prefixes of the composites above.
+REPLACED_INDEXES = (
+    ("ix_users_tenant", "users", ["tenant_id"]),
+    ("ix_objectives_tenant", "objectives", ["tenant_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name, table, _ in REPLACED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name, table, _ in reversed(COMPOSITE_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
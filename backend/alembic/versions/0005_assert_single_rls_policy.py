@@ -0,0 +1,45 @@
+"""Fail the upgrade if a table carries overlapping permissive RLS policies."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0005_assert_single_rls_policy"
+down_revision: str | None = "0004_tenant_composite_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# A FOR ALL policy applies to every command, so it overlaps with any
+# per-command policy for the same roles. PostgreSQL evaluates all of them per
+# row; merge such policies with USING (cond1 OR cond2) instead.
+ASSERT_SINGLE_POLICY = """
+DO $$
+DECLARE
+    offending text;
+BEGIN
+    SELECT string_agg(tablename || ' ' || roles::text || ' ' || cmd, ', ')
+      INTO offending
+      FROM (
+        SELECT p.tablename, p.roles, c.cmd
+          FROM pg_policies AS p
+          CROSS JOIN (VALUES ('SELECT'), ('INSERT'), ('UPDATE'), ('DELETE')) AS c (cmd)
+         WHERE p.schemaname = current_schema()
+           AND p.permissive = 'PERMISSIVE'
+           AND p.cmd IN (c.cmd, 'ALL')
+         GROUP BY p.tablename, p.roles, c.cmd
+        HAVING count(*) > 1
+      ) AS duplicates;
+
+    IF offending IS NOT NULL THEN
+        RAISE EXCEPTION 'Multiple permissive RLS policies per (table, roles, command): %', offending;
+    END IF;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(ASSERT_SINGLE_POLICY)
+
+
+def downgrade() -> None:
+    """Nothing to undo; the upgrade only validates existing policies."""
@@ -0,0 +1,37 @@
+"""Add BRIN indexes on created_at for time-ranged analytics scans."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0006_created_at_brin_indexes"
+down_revision: str | None = "0005_assert_single_rls_policy"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+TABLES = ("tenants", "workspaces", "users", "objectives", "key_results", "attachments")
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_created_brin",
+                table,
+                ["created_at"],
+                postgresql_using="brin",
+                postgresql_with={"pages_per_range": 32},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.drop_index(
+                f"ix_{table}_created_brin",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,78 @@
+"""Partition data_selection_logs by month on started_at."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0007_partition_data_selection_logs"
+down_revision: str | None = "0006_created_at_brin_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+COLUMNS = """
+    id uuid NOT NULL,
+    connector_type varchar(100) NOT NULL,
+    operation varchar(255) NOT NULL,
+    source varchar(500) NOT NULL,
+    parameters json,
+    status dataselectionstatus NOT NULL DEFAULT 'running',
+    row_count integer,
+    error_message text,
+    details json,
+    fail_safe_triggered boolean NOT NULL DEFAULT false,
+    started_at timestamptz NOT NULL DEFAULT now(),
+    finished_at timestamptz,
+    duration_ms integer"""
+
+COLUMN_NAMES = (
+    "id, connector_type, operation, source, parameters, status, row_count, error_message, "
+    "details, fail_safe_triggered, started_at, finished_at, duration_ms"
+)
+
+# Creates the partition covering the month of ``target`` if it is missing.
+# Called by the migration and by the data_connectors.ensure_log_partitions
+# beat task, which pre-creates next month's partition.
+ENSURE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION data_selection_logs_ensure_partition(target date)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    lower_bound date := date_trunc('month', target)::date;
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF data_selection_logs FOR VALUES FROM (%L) TO (%L)',
+        'data_selection_logs_' || to_char(lower_bound, 'YYYY_MM'),
+        lower_bound,
+        (lower_bound + interval '1 month')::date
+    );
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE data_selection_logs RENAME TO data_selection_logs_unpartitioned")
+    op.execute(
+        f"CREATE TABLE data_selection_logs ({COLUMNS},\n    PRIMARY KEY (id, started_at)\n) "
+        "PARTITION BY RANGE (started_at)"
+    )
+    op.execute("CREATE TABLE data_selection_logs_default PARTITION OF data_selection_logs DEFAULT")
+    op.execute(ENSURE_PARTITION_FUNCTION)
+    op.execute("SELECT data_selection_logs_ensure_partition(now()::date)")
+    op.execute("SELECT data_selection_logs_ensure_partition((now() + interval '1 month')::date)")
+    op.execute(
+        f"INSERT INTO data_selection_logs ({COLUMN_NAMES}) "
+        f"SELECT {COLUMN_NAMES} FROM data_selection_logs_unpartitioned"
+    )
+    op.execute("DROP TABLE data_selection_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE data_selection_logs RENAME TO data_selection_logs_partitioned")
+    op.execute(f"CREATE TABLE data_selection_logs ({COLUMNS},\n    PRIMARY KEY (id)\n)")
+    op.execute(
+        f"INSERT INTO data_selection_logs ({COLUMN_NAMES}) "
+        f"SELECT {COLUMN_NAMES} FROM data_selection_logs_partitioned"
+    )
+    op.execute("DROP TABLE data_selection_logs_partitioned")
+    op.execute("DROP FUNCTION IF EXISTS data_selection_logs_ensure_partition(date)")
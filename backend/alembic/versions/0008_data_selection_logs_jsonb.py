@@ -0,0 +1,41 @@
+"""Store data selection log payloads as JSONB and index parameters."""
+from typing import Sequence
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0008_data_selection_logs_jsonb"
+down_revision: str | None = "0007_partition_data_selection_logs"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+JSON_COLUMNS = ("parameters", "details")
+
+
+def upgrade() -> None:
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            "data_selection_logs",
+            column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f"{column}::jsonb",
+        )
+    # Partitioned tables do not support CONCURRENTLY; the index is created on
+    # the parent and cascades to every partition.
+    op.create_index(
+        "ix_dsl_parameters_gin",
+        "data_selection_logs",
+        ["parameters"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dsl_parameters_gin", table_name="data_selection_logs")
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            "data_selection_logs",
+            column,
+            type_=postgresql.JSON(),
+            postgresql_using=f"{column}::json",
+        )
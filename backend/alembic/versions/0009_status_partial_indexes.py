@@ -0,0 +1,43 @@
+"""Add partial indexes for the hot status values."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0009_status_partial_indexes"
+down_revision: str | None = "0008_data_selection_logs_jsonb"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+OBJECTIVES_ACTIVE = "status IN ('active', 'in_review', 'approved')"
+DSL_RUNNING = "status = 'running'"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_objectives_active",
+            "objectives",
+            ["tenant_id", "due_date"],
+            postgresql_where=sa.text(OBJECTIVES_ACTIVE),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    # data_selection_logs is partitioned, so this one cannot be concurrent.
+    op.create_index(
+        "ix_dsl_running",
+        "data_selection_logs",
+        ["started_at"],
+        postgresql_where=sa.text(DSL_RUNNING),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dsl_running", table_name="data_selection_logs")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_objectives_active",
+            table_name="objectives",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""Store key result progress as SMALLINT basis points."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0010_key_result_progress_basis_points"
+down_revision: str | None = "0009_status_partial_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+PROGRESS_SCALE = 10000
+
+
+def upgrade() -> None:
+    op.drop_constraint("ck_key_results_progress_range", "key_results", type_="check")
+    op.alter_column("key_results", "progress", server_default=None)
+    op.alter_column(
+        "key_results",
+        "progress",
+        type_=sa.SmallInteger(),
+        postgresql_using=f"round(progress * {PROGRESS_SCALE})::smallint",
+        server_default="0",
+    )
+    op.create_check_constraint(
+        "ck_key_results_progress_bp", "key_results", f"progress BETWEEN 0 AND {PROGRESS_SCALE}"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_key_results_progress_bp", "key_results", type_="check")
+    op.alter_column("key_results", "progress", server_default=None)
+    op.alter_column(
+        "key_results",
+        "progress",
+        type_=sa.Float(),
+        postgresql_using=f"progress::double precision / {PROGRESS_SCALE}",
+        server_default="0",
+    )
+    op.create_check_constraint(
+        "ck_key_results_progress_range", "key_results", "progress >= 0 AND progress <= 1"
+    )
@@ -0,0 +1,33 @@
+"""Generate UUID primary keys in the database."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0011_uuid_server_defaults"
+down_revision: str | None = "0010_key_result_progress_basis_points"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+TABLES = (
+    "tenants",
+    "workspaces",
+    "users",
+    "objectives",
+    "key_results",
+    "attachments",
+    "data_selection_logs",
+)
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto covers older servers.
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    op.execute(
+        ";\n".join(
+            f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()" for table in TABLES
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(";\n".join(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT" for table in TABLES))
@@ -0,0 +1,57 @@
+"""Replace the dataselectionstatus enum with VARCHAR plus a CHECK constraint."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0012_dsl_status_check"
+down_revision: str | None = "0011_uuid_server_defaults"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+STATUSES = ("running", "success", "fail_safe", "failure")
+STATUS_CHECK = "status IN (" + ", ".join(f"'{status}'" for status in STATUSES) + ")"
+
+
+def _recreate_running_index() -> None:
+    op.create_index(
+        "ix_dsl_running",
+        "data_selection_logs",
+        ["started_at"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
+
+
+def upgrade() -> None:
+    # The partial index predicate depends on the column type.
+    op.drop_index("ix_dsl_running", table_name="data_selection_logs")
+    op.alter_column("data_selection_logs", "status", server_default=None)
+    op.alter_column(
+        "data_selection_logs",
+        "status",
+        type_=sa.String(length=32),
+        postgresql_using="status::text",
+        server_default="running",
+    )
+    op.create_check_constraint("ck_dsl_status", "data_selection_logs", STATUS_CHECK)
+    op.execute("DROP TYPE IF EXISTS dataselectionstatus")
+    _recreate_running_index()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dsl_running", table_name="data_selection_logs")
+    op.drop_constraint("ck_dsl_status", "data_selection_logs", type_="check")
+    op.execute(
+        "CREATE TYPE dataselectionstatus AS ENUM ("
+        + ", ".join(f"'{status}'" for status in STATUSES)
+        + ")"
+    )
+    op.alter_column("data_selection_logs", "status", server_default=None)
+    op.alter_column(
+        "data_selection_logs",
+        "status",
+        type_=sa.Enum(*STATUSES, name="dataselectionstatus", create_type=False),
+        postgresql_using="status::dataselectionstatus",
+        server_default="running",
+    )
+    _recreate_running_index()
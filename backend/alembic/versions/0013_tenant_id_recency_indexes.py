@@ -0,0 +1,39 @@
+"""Add (tenant_id, id) and (tenant_id, created_at DESC) indexes."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0013_tenant_id_recency_indexes"
+down_revision: str | None = "0012_dsl_status_check"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# users already carries ix_users_tenant_id_id from 0004.
+TENANT_ID_TABLES = ("workspaces", "objectives", "key_results", "attachments")
+TENANT_CREATED_TABLES = ("workspaces", "users", "objectives", "key_results", "attachments")
+
+
+def _indexes() -> list[tuple[str, str, list]]:
+    return [
+        *((f"ix_{table}_tenant_id", table, ["tenant_id", "id"]) for table in TENANT_ID_TABLES),
+        *(
+            (f"ix_{table}_tenant_created", table, ["tenant_id", sa.text("created_at DESC")])
+            for table in TENANT_CREATED_TABLES
+        ),
+    ]
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns in _indexes():
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(_indexes()):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,47 @@
+"""Route tenant RLS policies through app.current_tenant_uuid()."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0014_current_tenant_function"
+down_revision: str | None = "0013_tenant_id_recency_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+TENANT_TABLES = ("workspaces", "users", "objectives", "key_results", "attachments")
+
+# Deliberately not SECURITY DEFINER: a plain STABLE SQL function is inlined by
+# the planner, so policies keep a transparent predicate. NULLIF turns an unset
+# or reset GUC ('') into NULL, which matches no rows instead of failing the cast.
+CURRENT_TENANT_FUNCTION = """
+CREATE OR REPLACE FUNCTION app.current_tenant_uuid()
+RETURNS uuid
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$ SELECT NULLIF(current_setting('app.current_tenant', true), '')::uuid $$
+"""
+
+CLAUSE = "tenant_id = (SELECT app.current_tenant_uuid())"
+PREVIOUS_CLAUSE = "tenant_id = (SELECT current_setting('app.current_tenant', true)::uuid)"
+
+
+def _alter_policies(clause: str) -> None:
+    op.execute(
+        ";\n".join(
+            f"ALTER POLICY {table}_tenant_isolation ON {table} USING ({clause}) WITH CHECK ({clause})"
+            for table in TENANT_TABLES
+        )
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE SCHEMA IF NOT EXISTS app")
+    op.execute(CURRENT_TENANT_FUNCTION)
+    _alter_policies(CLAUSE)
+
+
+def downgrade() -> None:
+    _alter_policies(PREVIOUS_CLAUSE)
+    op.execute("DROP FUNCTION IF EXISTS app.current_tenant_uuid()")
+    op.execute("DROP SCHEMA IF EXISTS app")
@@ -0,0 +1,35 @@
+"""Add a partial (workspace_id, due_date) index for active objectives."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0015_objectives_workspace_active"
+down_revision: str | None = "0014_current_tenant_function"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+OBJECTIVES_ACTIVE = "status IN ('active', 'in_review', 'approved')"
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_objectives_workspace_active",
+            "objectives",
+            ["workspace_id", "due_date"],
+            postgresql_where=sa.text(OBJECTIVES_ACTIVE),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_objectives_workspace_active",
+            table_name="objectives",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,48 @@
+"""Constrain users/objectives/key_results enum columns with CHECKs."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0016_status_check_constraints"
+down_revision: str | None = "0015_objectives_workspace_active"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# (table, column, constraint, allowed values, previous VARCHAR length)
+ENUM_COLUMNS = (
+    ("users", "status", "ck_users_status", ("active", "inactive"), 20),
+    (
+        "objectives",
+        "status",
+        "ck_objectives_status",
+        ("draft", "in_review", "approved", "active", "completed", "archived"),
+        50,
+    ),
+    (
+        "key_results",
+        "metric_type",
+        "ck_key_results_metric_type",
+        ("percentage", "absolute", "binary", "kpi"),
+        50,
+    ),
+)
+
+
+def _check(column: str, values: Sequence[str]) -> str:
+    return f"{column} IN (" + ", ".join(f"'{value}'" for value in values) + ")"
+
+
+def upgrade() -> None:
+    for table, column, constraint, values, _ in ENUM_COLUMNS:
+        # Rows written before the models persisted enum values hold member
+        # names ("ACTIVE"); fold them onto the lowercase values.
+        op.execute(f"UPDATE {table} SET {column} = lower({column}) WHERE {column} <> lower({column})")
+        op.alter_column(table, column, type_=sa.String(length=16))
+        op.create_check_constraint(constraint, table, _check(column, values))
+
+
+def downgrade() -> None:
+    for table, column, constraint, _, length in reversed(ENUM_COLUMNS):
+        op.drop_constraint(constraint, table, type_="check")
+        op.alter_column(table, column, type_=sa.String(length=length))
@@ -0,0 +1,52 @@
+"""Add covering INCLUDE indexes for user and key result lookups."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0017_covering_lookup_indexes"
+down_revision: str | None = "0016_status_check_constraints"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# (index name, table, key columns, included columns)
+COVERING_INDEXES = (
+    ("ix_users_lookup", "users", ["tenant_id", "workspace_id"], ["email", "full_name", "status"]),
+    (
+        "ix_kr_objective_cover",
+        "key_results",
+        ["objective_id"],
+        ["progress", "current_value", "target_value"],
+    ),
+)
+
+# Same key columns as the covering indexes above, so they become redundant.
+REPLACED_INDEXES = (
+    ("ix_users_tenant_workspace", "users", ["tenant_id", "workspace_id"]),
+    ("ix_key_results_objective", "key_results", ["objective_id"]),
+)
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in COVERING_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_include=include,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, table, _ in REPLACED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            op.create_index(
+                name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+        for name, table, _, _ in reversed(COVERING_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
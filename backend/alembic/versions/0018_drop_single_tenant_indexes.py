@@ -0,0 +1,34 @@
+"""Drop single-column tenant_id indexes covered by composite indexes."""
+from typing import Sequence
+
+from alembic import op
+
+revision: str = "0018_drop_single_tenant_indexes"
+down_revision: str | None = "0017_covering_lookup_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# Each index is a strict prefix of the (tenant_id, ...) composites added in
+# 0004 and 0013, so tenant-only predicates keep an index to use. users and
+# objectives lost theirs in 0004. Check pg_stat_user_indexes.idx_scan on
+# the composites before applying to a busy database.
+REDUNDANT_INDEXES = (
+    ("ix_workspaces_tenant", "workspaces"),
+    ("ix_key_results_tenant", "key_results"),
+    ("ix_attachments_tenant", "attachments"),
+)
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for name, table in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in reversed(REDUNDANT_INDEXES):
+            op.create_index(
+                name, table, ["tenant_id"], postgresql_concurrently=True, if_not_exists=True
+            )
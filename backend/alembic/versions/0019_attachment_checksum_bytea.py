@@ -0,0 +1,36 @@
+"""Store attachment checksums as raw SHA-256 bytes."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0019_attachment_checksum_bytea"
+down_revision: str | None = "0018_drop_single_tenant_indexes"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "attachments",
+        "checksum",
+        type_=sa.LargeBinary(),
+        postgresql_using="decode(checksum, 'hex')",
+    )
+    op.create_check_constraint(
+        "ck_attachments_checksum_sha256", "attachments", "octet_length(checksum) = 32"
+    )
+    # The type change rewrites the table under an exclusive lock already, so
+    # building the index concurrently would gain nothing.
+    op.create_index("ix_attachments_checksum", "attachments", ["tenant_id", "checksum"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_attachments_checksum", table_name="attachments")
+    op.drop_constraint("ck_attachments_checksum_sha256", "attachments", type_="check")
+    op.alter_column(
+        "attachments",
+        "checksum",
+        type_=sa.String(length=128),
+        postgresql_using="encode(checksum, 'hex')",
+    )
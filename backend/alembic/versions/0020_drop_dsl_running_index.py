@@ -0,0 +1,29 @@
+"""Drop the partial index on running data selection logs."""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0020_drop_dsl_running_index"
+down_revision: str | None = "0019_attachment_checksum_bytea"
+branch_labels: Sequence[str] | None = None
+depends_on: Sequence[str] | None = None
+
+# The journal writes each row once, when the operation finishes, so no row is
+# ever stored with status 'running' and the index stays empty. In-flight and
+# crashed operations are not audited.
+
+
+def upgrade() -> None:
+    # data_selection_logs is partitioned; DROP INDEX CONCURRENTLY is not
+    # supported there, and the empty index is cheap to drop.
+    op.drop_index("ix_dsl_running", table_name="data_selection_logs", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_dsl_running",
+        "data_selection_logs",
+        ["started_at"],
+        postgresql_where=sa.text("status = 'running'"),
+    )
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import importlib
 import logging
+from types import ModuleType
 
 logger = logging.getLogger(__name__)
 
-try:
-    # Import models so that metadata and RLS hooks are registered on startup.
-    from . import models  # noqa: F401  pylint: disable=unused-import
-except Exception as exc:  # pragma: no cover - defensive guard for partial envs
-    logger.debug("Skipping models import during package init: %s", exc)
-    models = None
+
+def __getattr__(name: str) -> ModuleType:
+    # Models are imported on first access so that ``import app`` (config-only
+    # CLIs, workers) does not pay for SQLAlchemy mapper configuration. Access
+    # ``app.models`` or import it directly to register metadata and RLS hooks.
+    if name == "models":
+        module = importlib.import_module(".models", __name__)
+        globals()["models"] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["models"]
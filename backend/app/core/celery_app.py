@@ -1,10 +1,76 @@
 """Celery application definition for asynchronous workloads."""
 from __future__ import annotations
 
+from typing import Any
+from uuid import UUID
+
+import msgpack
 from celery import Celery
+from celery.schedules import crontab
+from kombu.serialization import register
 
 from .config import get_settings
 
+TASK_SERIALIZER = "msgpack-uuid"
+
+# msgpack extension type carrying the 16 raw bytes of a UUID instead of its
+# 36-character string form.
+_UUID_EXT_TYPE = 1
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, UUID):
+        return msgpack.ExtType(_UUID_EXT_TYPE, obj.bytes)
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _UUID_EXT_TYPE:
+        return UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def _dumps(payload: Any) -> bytes:
+    return msgpack.packb(payload, default=_msgpack_default, use_bin_type=True)
+
+
+def _loads(payload: bytes) -> Any:
+    return msgpack.unpackb(payload, ext_hook=_msgpack_ext_hook, raw=False)
+
+
+register(
+    TASK_SERIALIZER,
+    _dumps,
+    _loads,
+    content_type="application/x-msgpack-uuid",
+    content_encoding="binary",
+)
+
+
+class CeleryConfig:
+    """Static Celery configuration loaded through ``config_from_object``."""
+
+    # Task modules are imported by the worker at startup; producers never
+    # import them just to send a task by name.
+    imports = (
+        "app.modules.notifications.tasks",
+        "app.modules.analytics.tasks",
+        "app.modules.data_connectors.tasks",
+    )
+    task_serializer = TASK_SERIALIZER
+    result_serializer = TASK_SERIALIZER
+    # JSON stays accepted so messages queued before the switch still drain.
+    accept_content = [TASK_SERIALIZER, "json"]
+    result_accept_content = [TASK_SERIALIZER, "json"]
+    worker_max_tasks_per_child = 1000
+    beat_scheduler = "celery.beat:PersistentScheduler"
+    beat_schedule = {
+        "data-connectors-log-partitions": {
+            "task": "app.modules.data_connectors.tasks.ensure_log_partitions",
+            "schedule": crontab(hour=0, minute=15),
+        },
+    }
+
 
 def create_celery() -> Celery:
     settings = get_settings()
@@ -12,24 +78,8 @@ def create_celery() -> Celery:
     broker_url = settings.rabbitmq_url or settings.redis_url
     backend_url = settings.redis_url
 
-    celery_app = Celery(
-        "okrio",
-        broker=broker_url,
-        backend=backend_url,
-        include=[
-            "app.modules.notifications.tasks",
-            "app.modules.analytics.tasks",
-            "app.modules.data_connectors.tasks",
-        ],
-    )
-
-    celery_app.conf.update(
-        task_serializer="json",
-        result_serializer="json",
-        accept_content=["json"],
-        worker_max_tasks_per_child=100,
-        beat_scheduler="celery.beat:PersistentScheduler",
-    )
+    celery_app = Celery("okrio", broker=broker_url, backend=backend_url)
+    celery_app.config_from_object(CeleryConfig)
 
     return celery_app
 
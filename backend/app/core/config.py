@@ -2,11 +2,23 @@
 from __future__ import annotations
 
 import os
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
 
-from pydantic import AnyHttpUrl, BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import (
+    AnyHttpUrl,
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    ValidatorFunctionWrapHandler,
+    field_validator,
+    model_validator,
+)
+
+# Backend project root; resolved once since resolve() stats every component.
+_BASE_DIR = Path(__file__).resolve().parents[2]
 
 
 class Settings(BaseModel):
@@ -30,7 +42,7 @@ class Settings(BaseModel):
     rate_limit_requests: int = Field(1000, alias="RATE_LIMIT_REQUESTS")
     rate_limit_window_seconds: int = Field(60, alias="RATE_LIMIT_WINDOW_SECONDS")
 
-    storage_root: Path = Field(Path("./var/storage"), alias="STORAGE_ROOT")
+    storage_root: Path = Field(Path("./var/storage"), alias="STORAGE_ROOT", validate_default=True)
 
     azure_tenant_id: str = Field(..., alias="AZURE_TENANT_ID")
     azure_client_id: str = Field(..., alias="AZURE_CLIENT_ID")
@@ -47,27 +59,51 @@ class Settings(BaseModel):
 
     rabbitmq_url: str | None = Field(None, alias="RABBITMQ_URL")
 
-    @field_validator("cors_origins", mode="before")
-    def split_cors_origins(cls, value: str | List[str]) -> List[AnyHttpUrl]:
+    workflow_history_limit: int = Field(
+        100,
+        ge=1,
+        alias="WORKFLOW_HISTORY_LIMIT",
+        description="Most recent history entries kept per workflow instance",
+    )
+
+    scim_preload_directory: bool = Field(
+        False,
+        alias="SCIM_PRELOAD_DIRECTORY",
+        description="Create the SCIM directory at startup instead of on first request",
+    )
+
+    @field_validator("cors_origins", mode="wrap")
+    def split_cors_origins(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler
+    ) -> List[AnyHttpUrl]:
         if isinstance(value, str):
-            return [origin.strip() for origin in value.split(",") if origin.strip()]
-        return value
+            return list(_parse_cors_origins(value))
+        # Already-parsed URLs (e.g. model_copy/reconstruction) skip re-validation.
+        if isinstance(value, list) and all(isinstance(origin, AnyHttpUrl) for origin in value):
+            return value
+        return handler(value)
 
     @field_validator("storage_root", mode="before")
     def expand_storage_root(cls, value: str | Path) -> Path:
         path = Path(value).expanduser()
-        base_dir = Path(__file__).resolve().parents[2]
         if not path.is_absolute():
-            path = base_dir / path
-        return path.resolve()
+            path = _BASE_DIR / path
+        # normpath collapses ".." lexically; resolve() would stat every component.
+        return Path(os.path.normpath(path))
+
+    @cached_property
+    def cors_origins_str(self) -> List[str]:
+        """CORS origins as plain strings, falling back to the frontend URL."""
+
+        return [str(origin) for origin in self.cors_origins] or [str(self.frontend_url)]
 
     @model_validator(mode="after")
-    def validate_azure_settings(cls, values: "Settings") -> "Settings":
+    def validate_azure_settings(self) -> "Settings":
         """Ensure that Azure OAuth configuration is complete."""
 
-        client_secret = values.azure_client_secret
-        frontend_redirect = values.azure_redirect_uri_frontend
-        backend_redirect = values.azure_redirect_uri_backend
+        client_secret = self.azure_client_secret
+        frontend_redirect = self.azure_redirect_uri_frontend
+        backend_redirect = self.azure_redirect_uri_backend
 
         if not frontend_redirect:
             raise ValueError("AZURE_REDIRECT_URI_FRONTEND must be provided")
@@ -82,40 +118,67 @@ class Settings(BaseModel):
                 "AZURE_CLIENT_SECRET must be provided when AZURE_REDIRECT_URI_BACKEND is set"
             )
 
-        return values
+        return self
 
     @classmethod
     def _load_env_file(cls, path: Path) -> Dict[str, str]:
-        data: Dict[str, str] = {}
-        if not path.exists():
-            return data
-        for raw_line in path.read_text(encoding="utf-8").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            data[key.strip()] = value.strip().strip('"').strip("'")
-        return data
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        return dict(_load_env_file_cached(str(path), mtime_ns))
 
     @classmethod
     def load(cls) -> "Settings":
         """Instantiate settings from environment variables and optional .env file."""
 
-        base_dir = Path(__file__).resolve().parents[2]
-        env_file_values = cls._load_env_file(base_dir / ".env")
+        env_file_values = cls._load_env_file(_BASE_DIR / ".env")
         combined_env: Dict[str, str] = {**env_file_values, **os.environ}
 
-        init_values: Dict[str, object] = {}
-        for field_name, field in cls.model_fields.items():
-            alias = field.alias or field_name
-            if alias in combined_env:
-                init_values[field_name] = combined_env[alias]
-
+        init_values: Dict[str, object] = {
+            name: combined_env[alias]
+            for name, alias in _env_aliases(cls)
+            if alias in combined_env
+        }
         return cls(**init_values)
 
 
+_CORS_ORIGINS_ADAPTER = TypeAdapter(List[AnyHttpUrl])
+
+
+@lru_cache(maxsize=8)
+def _parse_cors_origins(raw: str) -> Tuple[AnyHttpUrl, ...]:
+    """Split and validate a comma separated ``CORS_ORIGINS`` value once per string."""
+
+    origins = [origin.strip() for origin in raw.split(",") if origin.strip()]
+    return tuple(_CORS_ORIGINS_ADAPTER.validate_python(origins))
+
+
+@lru_cache
+def _env_aliases(settings_cls: type[Settings]) -> Tuple[Tuple[str, str], ...]:
+    """Return ``(field name, environment variable)`` pairs for a settings class."""
+
+    return tuple(
+        (name, field.alias or name) for name, field in settings_cls.model_fields.items()
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_env_file_cached(path: str, mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    """Parse a ``.env`` file; keyed on mtime so edits are picked up on reload."""
+
+    data: Dict[str, str] = {}
+    for raw_line in Path(path).read_text(encoding="utf-8").splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        data[key.strip()] = value.strip().strip('"').strip("'")
+    return tuple(data.items())
+
+
 @lru_cache
 def get_settings() -> Settings:
     """Return memoized settings instance."""
@@ -10,13 +10,21 @@ from .config import get_settings
 
 Base = declarative_base()
 
+# Compiled statement cache entries per engine (SQLAlchemy default is 500).
+QUERY_CACHE_SIZE = 1200
+
 
 class Database:
     """Encapsulate SQLAlchemy engine and session handling."""
 
     def __init__(self) -> None:
         self._settings = get_settings()
-        self._engine = create_engine(self._settings.postgres_url, future=True, pool_pre_ping=True)
+        self._engine = create_engine(
+            self._settings.postgres_url,
+            future=True,
+            pool_pre_ping=True,
+            query_cache_size=QUERY_CACHE_SIZE,
+        )
         self._session_factory = sessionmaker(bind=self._engine, class_=Session, expire_on_commit=False)
 
     @contextmanager
@@ -1,29 +1,47 @@
 """FastAPI application factory for OKRio."""
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from .core.config import Settings, get_settings
 from .modules.analytics.router import router as analytics_router
+from .modules.auth.directory import preload_directory
 from .modules.auth.router import router as auth_router
+from .modules.auth.services.azure import get_azure_client
 from .modules.integrations.router import router as integrations_router
 from .modules.notifications.router import router as notifications_router
 from .modules.okr.router import router as okr_router
 from .modules.org.router import router as org_router
 from .modules.workflow.router import router as workflow_router
+from .modules.data_connectors.journal import close_journal_sink
 from .modules.data_connectors.router import router as data_connectors_router
 from .modules.accounts.router import router as accounts_router
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    await get_azure_client().aclose()
+    # Joins the writer thread; keep it off the event loop.
+    await run_in_threadpool(close_journal_sink)
+
+
 def create_application(settings: Settings | None = None) -> FastAPI:
     settings = settings or get_settings()
 
-    app = FastAPI(title=settings.project_name)
+    app = FastAPI(title=settings.project_name, lifespan=lifespan)
+
+    if settings.scim_preload_directory:
+        preload_directory()
 
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.cors_origins] or [str(settings.frontend_url)],
+        allow_origins=settings.cors_origins_str,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
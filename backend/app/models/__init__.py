@@ -4,19 +4,24 @@ from __future__ import annotations
 import enum
 from datetime import date, datetime, timezone
 from typing import List, Optional
-from uuid import UUID as UUIDType, uuid4
+from uuid import UUID as UUIDType
 
 from sqlalchemy import (
+    DDL,
     CheckConstraint,
     Date,
     DateTime,
     Enum,
     ForeignKey,
     Index,
+    LargeBinary,
+    SmallInteger,
     String,
     Text,
     UniqueConstraint,
     event,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -38,18 +43,60 @@ class TimestampMixin:
     )
 
 
+def _created_at_brin(table_name: str) -> Index:
+    """BRIN index on ``created_at``; tiny for append-mostly timestamp columns."""
+
+    return Index(
+        f"ix_{table_name}_created_brin",
+        "created_at",
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def _enum_values(enum_cls: type[enum.Enum]) -> List[str]:
+    """Persist enum values (``"active"``) rather than member names (``"ACTIVE"``)."""
+
+    return [member.value for member in enum_cls]
+
+
+def _enum_column(enum_cls: type[enum.Enum]) -> Enum:
+    """VARCHAR(16) column type converting to and from ``enum_cls`` at the edge.
+
+    Plain strings guarded by a CHECK (see :func:`_enum_check`) instead of a
+    PostgreSQL ENUM type, so new values never need ``ALTER TYPE``.
+    """
+
+    return Enum(enum_cls, native_enum=False, length=16, values_callable=_enum_values)
+
+
+def _enum_check(column: str, enum_cls: type[enum.Enum], name: str) -> CheckConstraint:
+    allowed = ", ".join(f"'{value}'" for value in _enum_values(enum_cls))
+    return CheckConstraint(f"{column} IN ({allowed})", name=name)
+
+
+def _tenant_created(table_name: str) -> Index:
+    """Newest-first listing within a tenant, matching the RLS filter."""
+
+    return Index(f"ix_{table_name}_tenant_created", "tenant_id", text("created_at DESC"))
+
+
 class Tenant(Base, TimestampMixin):
     """Tenant represents a company account."""
 
     __tablename__ = "tenants"
 
-    id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     slug: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
 
     workspaces: Mapped[List["Workspace"]] = relationship("Workspace", back_populates="tenant")
     users: Mapped[List["User"]] = relationship("User", back_populates="tenant")
 
+    __table_args__ = (_created_at_brin("tenants"),)
+
 
 class TenantScopedMixin:
     """Mixin for entities that belong to a tenant."""
@@ -62,7 +109,9 @@ class Workspace(Base, TimestampMixin, TenantScopedMixin):
 
     __tablename__ = "workspaces"
 
-    id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     parent_id: Mapped[Optional[UUIDType]] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id"))
@@ -75,7 +124,9 @@ class Workspace(Base, TimestampMixin, TenantScopedMixin):
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "name", name="uq_workspace_name_per_tenant"),
-        Index("ix_workspaces_tenant", "tenant_id"),
+        Index("ix_workspaces_tenant_id", "tenant_id", "id"),
+        _tenant_created("workspaces"),
+        _created_at_brin("workspaces"),
     )
 
 
@@ -89,12 +140,16 @@ class User(Base, TimestampMixin, TenantScopedMixin):
 
     __tablename__ = "users"
 
-    id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     external_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     email: Mapped[str] = mapped_column(String(320), nullable=False)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
     job_title: Mapped[Optional[str]] = mapped_column(String(255))
-    status: Mapped[UserStatus] = mapped_column(Enum(UserStatus), default=UserStatus.ACTIVE, nullable=False)
+    status: Mapped[UserStatus] = mapped_column(
+        _enum_column(UserStatus), default=UserStatus.ACTIVE, nullable=False
+    )
     workspace_id: Mapped[Optional[UUIDType]] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id"))
     manager_id: Mapped[Optional[UUIDType]] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"))
 
@@ -107,8 +162,18 @@ class User(Base, TimestampMixin, TenantScopedMixin):
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "email", name="uq_user_email_per_tenant"),
-        Index("ix_users_tenant", "tenant_id"),
+        _enum_check("status", UserStatus, "ck_users_status"),
+        Index("ix_users_tenant_id_id", "tenant_id", "id"),
+        # Covers the common tenant/workspace user listing without heap fetches.
+        Index(
+            "ix_users_lookup",
+            "tenant_id",
+            "workspace_id",
+            postgresql_include=["email", "full_name", "status"],
+        ),
         Index("ix_users_workspace", "workspace_id"),
+        _tenant_created("users"),
+        _created_at_brin("users"),
     )
 
 
@@ -121,16 +186,23 @@ class ObjectiveStatus(str, enum.Enum):
     ARCHIVED = "archived"
 
 
+_OBJECTIVES_ACTIVE = "status IN ('active', 'in_review', 'approved')"
+
+
 class Objective(Base, TimestampMixin, TenantScopedMixin):
     """Represents an Objective in the OKR framework."""
 
     __tablename__ = "objectives"
 
-    id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text)
     status: Mapped[ObjectiveStatus] = mapped_column(
-        Enum(ObjectiveStatus), default=ObjectiveStatus.DRAFT, nullable=False
+        _enum_column(ObjectiveStatus),
+        default=ObjectiveStatus.DRAFT,
+        nullable=False,
     )
     start_date: Mapped[date] = mapped_column(Date, nullable=False)
     due_date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -145,8 +217,26 @@ class Objective(Base, TimestampMixin, TenantScopedMixin):
 
     __table_args__ = (
         CheckConstraint("start_date <= due_date", name="ck_objectives_dates"),
-        Index("ix_objectives_tenant", "tenant_id"),
+        _enum_check("status", ObjectiveStatus, "ck_objectives_status"),
+        Index("ix_objectives_tenant_workspace_due", "tenant_id", "workspace_id", "due_date"),
         Index("ix_objectives_workspace", "workspace_id"),
+        Index("ix_objectives_tenant_id", "tenant_id", "id"),
+        _tenant_created("objectives"),
+        Index(
+            "ix_objectives_active",
+            "tenant_id",
+            "due_date",
+            postgresql_where=text(_OBJECTIVES_ACTIVE),
+        ),
+        # Workspace dashboards: active objectives ordered by due date. The plain
+        # ix_objectives_workspace stays for the FK cascade and join paths.
+        Index(
+            "ix_objectives_workspace_active",
+            "workspace_id",
+            "due_date",
+            postgresql_where=text(_OBJECTIVES_ACTIVE),
+        ),
+        _created_at_brin("objectives"),
     )
 
 
@@ -157,21 +247,27 @@ class KeyResultType(str, enum.Enum):
     KPI = "kpi"
 
 
+# Key result progress is stored as basis points: 10000 == 100%.
+PROGRESS_SCALE = 10000
+
+
 class KeyResult(Base, TimestampMixin, TenantScopedMixin):
     """Represents progress measurement for an objective."""
 
     __tablename__ = "key_results"
 
-    id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     objective_id: Mapped[UUIDType] = mapped_column(
         UUID(as_uuid=True), ForeignKey("objectives.id"), nullable=False
     )
     title: Mapped[str] = mapped_column(String(500), nullable=False)
-    metric_type: Mapped[KeyResultType] = mapped_column(Enum(KeyResultType), nullable=False)
+    metric_type: Mapped[KeyResultType] = mapped_column(_enum_column(KeyResultType), nullable=False)
     target_value: Mapped[float] = mapped_column(nullable=False)
     current_value: Mapped[float] = mapped_column(nullable=False, default=0.0)
     unit: Mapped[Optional[str]] = mapped_column(String(50))
-    progress: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    progress: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0)
     last_refreshed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
 
     objective: Mapped["Objective"] = relationship("Objective", back_populates="key_results")
@@ -180,18 +276,34 @@ class KeyResult(Base, TimestampMixin, TenantScopedMixin):
     )
 
     __table_args__ = (
-        CheckConstraint("progress >= 0 AND progress <= 1", name="ck_key_results_progress_range"),
-        Index("ix_key_results_objective", "objective_id"),
-        Index("ix_key_results_tenant", "tenant_id"),
+        CheckConstraint(f"progress BETWEEN 0 AND {PROGRESS_SCALE}", name="ck_key_results_progress_bp"),
+        _enum_check("metric_type", KeyResultType, "ck_key_results_metric_type"),
+        Index(
+            "ix_kr_objective_cover",
+            "objective_id",
+            postgresql_include=["progress", "current_value", "target_value"],
+        ),
+        Index("ix_key_results_tenant_objective", "tenant_id", "objective_id"),
+        Index("ix_key_results_tenant_id", "tenant_id", "id"),
+        _tenant_created("key_results"),
+        _created_at_brin("key_results"),
     )
 
+    @property
+    def progress_ratio(self) -> float:
+        """Progress as a fraction between 0 and 1."""
+
+        return self.progress / PROGRESS_SCALE
+
 
 class Attachment(Base, TimestampMixin, TenantScopedMixin):
     """Metadata for files stored on the local filesystem."""
 
     __tablename__ = "attachments"
 
-    id: Mapped[UUIDType] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUIDType] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     key_result_id: Mapped[Optional[UUIDType]] = mapped_column(
         UUID(as_uuid=True), ForeignKey("key_results.id")
     )
@@ -201,36 +313,60 @@ class Attachment(Base, TimestampMixin, TenantScopedMixin):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[str] = mapped_column(String(255), nullable=False)
     size: Mapped[int] = mapped_column(nullable=False)
-    checksum: Mapped[str] = mapped_column(String(128), nullable=False)
+    # Raw 32-byte SHA-256 digest.
+    checksum: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     storage_path: Mapped[str] = mapped_column(String(500), nullable=False)
 
     key_result: Mapped[Optional["KeyResult"]] = relationship("KeyResult", back_populates="attachments")
     objective: Mapped[Optional["Objective"]] = relationship("Objective")
 
-    __table_args__ = (Index("ix_attachments_tenant", "tenant_id"),)
+    __table_args__ = (
+        CheckConstraint("octet_length(checksum) = 32", name="ck_attachments_checksum_sha256"),
+        Index("ix_attachments_tenant_kr", "tenant_id", "key_result_id"),
+        Index("ix_attachments_checksum", "tenant_id", "checksum"),
+        Index("ix_attachments_tenant_id", "tenant_id", "id"),
+        _tenant_created("attachments"),
+        _created_at_brin("attachments"),
+    )
+
+
+# Inlinable STABLE function (not SECURITY DEFINER) shared by every tenant policy.
+# NULLIF maps an unset GUC to NULL so queries without a tenant see no rows.
+# gen_random_uuid() is built in from PostgreSQL 13; pgcrypto covers older servers.
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+event.listen(Base.metadata, "before_create", DDL("CREATE SCHEMA IF NOT EXISTS app"))
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL(
+        "CREATE OR REPLACE FUNCTION app.current_tenant_uuid() RETURNS uuid "
+        "LANGUAGE sql STABLE PARALLEL SAFE "
+        "AS $$ SELECT NULLIF(current_setting('app.current_tenant', true), '')::uuid $$"
+    ),
+)
 
 
 def _register_tenant_rls(table_name: str) -> None:
     policy_name = f"{table_name}_tenant_isolation"
-    clause = (
-        "current_setting('app.current_tenant', true) IS NOT NULL "
-        "AND tenant_id = current_setting('app.current_tenant')::uuid"
-    )
+    # Scalar subselect so PostgreSQL evaluates the function once per query (InitPlan).
+    clause = "tenant_id = (SELECT app.current_tenant_uuid())"
     table = Base.metadata.tables[table_name]
 
-    event.listen(table, "after_create", event.DDL(f"ALTER TABLE {table_name} ENABLE ROW LEVEL SECURITY"))
-    event.listen(table, "after_create", event.DDL(f"ALTER TABLE {table_name} FORCE ROW LEVEL SECURITY"))
+    # One multi-statement DDL so table creation costs a single round-trip.
     event.listen(
         table,
         "after_create",
-        event.DDL(
-            f"CREATE POLICY {policy_name} ON {table_name} USING ({clause}) WITH CHECK ({clause})"
+        DDL(
+            f"ALTER TABLE {table_name} ENABLE ROW LEVEL SECURITY; "
+            f"ALTER TABLE {table_name} FORCE ROW LEVEL SECURITY; "
+            f"CREATE POLICY {policy_name} ON {table_name} AS PERMISSIVE FOR ALL "
+            f"USING ({clause}) WITH CHECK ({clause})"
         ),
     )
     event.listen(
         table,
         "before_drop",
-        event.DDL(f"DROP POLICY IF EXISTS {policy_name} ON {table_name}"),
+        DDL(f"DROP POLICY IF EXISTS {policy_name} ON {table_name}"),
     )
 
 
@@ -244,6 +380,7 @@ __all__ = [
     "KeyResultType",
     "Objective",
     "ObjectiveStatus",
+    "PROGRESS_SCALE",
     "Tenant",
     "TenantScopedMixin",
     "User",
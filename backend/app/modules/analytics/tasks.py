@@ -4,9 +4,12 @@ from __future__ import annotations
 from celery import shared_task
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def example_task(payload: dict[str, str]) -> dict[str, str]:
-    """Placeholder task that echoes the payload."""
+    """Placeholder task that echoes the payload.
+
+    Fire-and-forget: the return value is not stored in the result backend.
+    """
 
     return {"module": "analytics", **payload}
 
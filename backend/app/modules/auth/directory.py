@@ -1,175 +1,442 @@
 """In-memory directory backing SCIM endpoints."""
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from threading import RLock
-from typing import Dict, List
+from functools import lru_cache
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence
 from uuid import uuid4
 
+from pydantic import TypeAdapter, ValidationError
+
 from .schemas import (
+    SCIM_OP_REPLACE,
     SCIMEmail,
     SCIMGroup,
     SCIMGroupCreateRequest,
     SCIMGroupMember,
+    SCIMName,
     SCIMUser,
     SCIMUserCreateRequest,
+    SCIMUserPatchOperation,
 )
 
 
-@dataclass
+class _ReadWriteLock:
+    """Many concurrent readers or one writer; waiting writers block new readers."""
+
+    def __init__(self) -> None:
+        self._cond = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+@dataclass(slots=True)
 class DirectoryUser:
     id: str
     userName: str
     active: bool = True
     displayName: str | None = None
-    name: dict | None = None
-    emails: List[dict] = field(default_factory=list)
+    # Stored as the validated models, which are shared and never mutated.
+    name: SCIMName | None = None
+    emails: List[SCIMEmail] = field(default_factory=list)
     externalId: str | None = None
+    # Bumped on every change; SCIM responses derive their ETag from it.
+    version: int = field(default=1, compare=False)
+    _api: SCIMUser | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_api(self) -> SCIMUser:
-        emails = [SCIMEmail(**email) for email in self.emails]
-        return SCIMUser(
-            id=self.id,
-            userName=self.userName,
-            active=self.active,
-            displayName=self.displayName,
-            name=self.name,
-            emails=emails,
-            externalId=self.externalId,
-        )
-
-
-@dataclass
+        """Return the SCIM projection, built once until :meth:`invalidate`."""
+
+        if self._api is None:
+            # Every field was validated on the way in; skip revalidation.
+            self._api = SCIMUser.model_construct(
+                id=self.id,
+                userName=self.userName,
+                active=self.active,
+                displayName=self.displayName,
+                name=self.name,
+                emails=list(self.emails),
+                externalId=self.externalId,
+            )
+        return self._api
+
+    def apply(self, payload: SCIMUserCreateRequest) -> None:
+        """Overwrite every attribute from a full (PUT) representation."""
+
+        self.userName = payload.userName
+        self.active = payload.active
+        self.displayName = payload.displayName
+        self.name = payload.name
+        self.emails = payload.emails
+        self.externalId = payload.externalId
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._api = None
+        self.version += 1
+
+
+@dataclass(slots=True)
 class DirectoryGroup:
     id: str
     displayName: str
-    members: List[SCIMGroupMember] = field(default_factory=list)
+    # Keyed by member ``value``; insertion order is the SCIM member order.
+    members: Dict[str, SCIMGroupMember] = field(default_factory=dict)
+    version: int = field(default=1, compare=False)
+    _api: SCIMGroup | None = field(default=None, init=False, repr=False, compare=False)
+
+    def add_member(self, member: SCIMGroupMember) -> bool:
+        """Append ``member`` unless its ``value`` is already present."""
+
+        if member.value in self.members:
+            return False
+        self.members[member.value] = member
+        self.invalidate()
+        return True
+
+    def remove_member(self, member_id: str) -> bool:
+        if self.members.pop(member_id, None) is None:
+            return False
+        self.invalidate()
+        return True
 
     def to_api(self) -> SCIMGroup:
-        return SCIMGroup(id=self.id, displayName=self.displayName, members=self.members)
+        """Return the SCIM projection, built once until :meth:`invalidate`."""
+
+        if self._api is None:
+            self._api = SCIMGroup.model_construct(
+                id=self.id, displayName=self.displayName, members=list(self.members.values())
+            )
+        return self._api
+
+    def apply(self, payload: SCIMGroupCreateRequest) -> None:
+        """Overwrite every attribute from a full (PUT) representation."""
+
+        self.displayName = payload.displayName
+        self.members = _index_members(payload.members)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._api = None
+        self.version += 1
+
+
+def _index_members(members: Iterable[SCIMGroupMember]) -> Dict[str, SCIMGroupMember]:
+    """Key members by ``value``; the first occurrence of a duplicate wins."""
+
+    indexed: Dict[str, SCIMGroupMember] = {}
+    for member in members:
+        indexed.setdefault(member.value, member)
+    return indexed
+
+
+@dataclass(frozen=True, slots=True)
+class PatchResult:
+    """Outcome of a member change that skipped building the group projection."""
+
+    version: int
+
+
+_EMAILS_ADAPTER = TypeAdapter(List[SCIMEmail])
+
+UserPatchHandler = Callable[[DirectoryUser, Any], None]
+
+
+def _replace_attribute(
+    attribute: str, expected_type: type, validate: Callable[[Any], Any] | None = None
+) -> UserPatchHandler:
+    """Build a ``replace`` handler; values of the wrong shape are ignored."""
+
+    def replace(user: DirectoryUser, value: Any) -> None:
+        if not isinstance(value, expected_type):
+            return
+        if validate is not None:
+            try:
+                value = validate(value)
+            except ValidationError:
+                return
+        setattr(user, attribute, value)
+
+    return replace
+
+
+# Lower-cased SCIM PATCH path -> handler applying a ``replace`` operation.
+_USER_PATCH_HANDLERS: Dict[str, UserPatchHandler] = {
+    "active": _replace_attribute("active", bool),
+    "displayname": _replace_attribute("displayName", str),
+    "name": _replace_attribute("name", dict, SCIMName.model_validate),
+    "emails": _replace_attribute("emails", list, _EMAILS_ADAPTER.validate_python),
+}
 
 
 class InMemoryDirectory:
-    """Thread-safe directory implementation used for the SCIM facade."""
+    """Thread-safe directory implementation used for the SCIM facade.
+
+    SCIM projections are cached per entry and for the full listings; every
+    write drops the affected caches, so reads never rebuild Pydantic models
+    for unchanged entries. Returned models are shared and must not be mutated.
+
+    Single-entry lookups keep ``(projection, version)`` per id and serve it
+    without taking the lock while the version still matches the row: writers
+    publish with one dict store (atomic under the GIL) and bump the row
+    version only after mutating it. A stale or missing entry, e.g. after a
+    member change without ``return_representation``, is rebuilt under the
+    read lock on the next lookup.
+    """
 
     def __init__(self) -> None:
         self._users: Dict[str, DirectoryUser] = {}
         self._groups: Dict[str, DirectoryGroup] = {}
-        self._lock = RLock()
+        self._lock = _ReadWriteLock()
+        self._user_list: List[SCIMUser] | None = None
+        self._group_list: List[SCIMGroup] | None = None
+        # id -> (projection, version), published together in one store.
+        self._user_views: Dict[str, tuple[SCIMUser, int]] = {}
+        self._group_views: Dict[str, tuple[SCIMGroup, int]] = {}
+        # Case-folded userName -> ids (insertion ordered) for ``userName eq``
+        # filters. userName is not case-exact in SCIM and is not enforced unique.
+        self._user_names: Dict[str, Dict[str, None]] = {}
+
+    def _index_user_name(self, user: DirectoryUser) -> None:
+        self._user_names.setdefault(user.userName.casefold(), {})[user.id] = None
+
+    def _unindex_user_name(self, user: DirectoryUser) -> None:
+        key = user.userName.casefold()
+        ids = self._user_names.get(key)
+        if ids is not None:
+            ids.pop(user.id, None)
+            if not ids:
+                del self._user_names[key]
+
+    def _publish_user(self, user: DirectoryUser) -> SCIMUser:
+        view = user.to_api()
+        self._user_views[user.id] = (view, user.version)
+        self._user_list = None
+        return view
+
+    def _publish_group(self, group: DirectoryGroup) -> SCIMGroup:
+        view = group.to_api()
+        self._group_views[group.id] = (view, group.version)
+        self._group_list = None
+        return view
+
+    @staticmethod
+    def _current_view(
+        rows: Dict[str, Any], views: Dict[str, tuple[Any, int]], lock: _ReadWriteLock, entry_id: str
+    ) -> tuple[Any, int] | None:
+        row = rows.get(entry_id)
+        if row is None:
+            return None
+        entry = views.get(entry_id)
+        if entry is not None and entry[1] == row.version:
+            return entry
+        with lock.read():
+            row = rows.get(entry_id)
+            if row is None:
+                return None
+            entry = (row.to_api(), row.version)
+            views[entry_id] = entry
+            return entry
 
     # -- User management ---------------------------------------------------
     def create_user(self, payload: SCIMUserCreateRequest) -> SCIMUser:
-        with self._lock:
+        with self._lock.write():
             user_id = str(uuid4())
             user = DirectoryUser(
                 id=user_id,
                 userName=payload.userName,
                 active=payload.active,
                 displayName=payload.displayName,
-                name=payload.name.model_dump() if payload.name else None,
-                emails=[email.model_dump() for email in payload.emails],
+                name=payload.name,
+                emails=payload.emails,
                 externalId=payload.externalId,
             )
             self._users[user_id] = user
-            return user.to_api()
+            self._index_user_name(user)
+            return self._publish_user(user)
 
     def list_users(self) -> List[SCIMUser]:
-        with self._lock:
-            return [user.to_api() for user in self._users.values()]
+        with self._lock.read():
+            # Concurrent readers may both rebuild; they produce the same list.
+            if self._user_list is None:
+                self._user_list = [user.to_api() for user in self._users.values()]
+            return list(self._user_list)
+
+    def find_users_by_username(self, user_name: str) -> List[SCIMUser]:
+        """Resolve a ``userName eq`` filter through the index, not a scan."""
+
+        with self._lock.read():
+            user_ids = list(self._user_names.get(user_name.casefold(), ()))
+        return [user for user in map(self.get_user, user_ids) if user is not None]
 
     def get_user(self, user_id: str) -> SCIMUser | None:
-        with self._lock:
-            user = self._users.get(user_id)
-            return user.to_api() if user else None
+        entry = self.get_user_versioned(user_id)
+        return entry[0] if entry else None
+
+    def get_user_versioned(self, user_id: str) -> tuple[SCIMUser, int] | None:
+        """Return the user projection with its version, for ETags."""
+
+        return self._current_view(self._users, self._user_views, self._lock, user_id)
 
     def replace_user(self, user_id: str, payload: SCIMUserCreateRequest) -> SCIMUser | None:
-        with self._lock:
-            if user_id not in self._users:
+        with self._lock.write():
+            user = self._users.get(user_id)
+            if not user:
                 return None
-            user = DirectoryUser(
-                id=user_id,
-                userName=payload.userName,
-                active=payload.active,
-                displayName=payload.displayName,
-                name=payload.name.model_dump() if payload.name else None,
-                emails=[email.model_dump() for email in payload.emails],
-                externalId=payload.externalId,
-            )
-            self._users[user_id] = user
-            return user.to_api()
+            self._unindex_user_name(user)
+            user.apply(payload)
+            self._index_user_name(user)
+            return self._publish_user(user)
 
-    def patch_user(self, user_id: str, operations: list[dict]) -> SCIMUser | None:
-        with self._lock:
+    def patch_user(self, user_id: str, operations: Sequence[SCIMUserPatchOperation]) -> SCIMUser | None:
+        with self._lock.write():
             user = self._users.get(user_id)
             if not user:
                 return None
             for op in operations:
-                operation = op.get("op", "").lower()
-                path = op.get("path", "")
-                value = op.get("value")
-                if operation == "replace" and path.lower() == "active" and isinstance(value, bool):
-                    user.active = value
-                elif operation == "replace" and path.lower() == "displayname" and isinstance(value, str):
-                    user.displayName = value
-                elif operation == "replace" and path.lower() == "name" and isinstance(value, dict):
-                    user.name = value
-                elif operation == "replace" and path.lower() == "emails" and isinstance(value, list):
-                    user.emails = value
-            return user.to_api()
+                if op.op != SCIM_OP_REPLACE:
+                    continue
+                handler = _USER_PATCH_HANDLERS.get((op.path or "").lower())
+                if handler is not None:
+                    handler(user, op.value)
+            user.invalidate()
+            return self._publish_user(user)
 
     def delete_user(self, user_id: str) -> bool:
-        with self._lock:
-            return self._users.pop(user_id, None) is not None
+        with self._lock.write():
+            user = self._users.pop(user_id, None)
+            if user is None:
+                return False
+            self._unindex_user_name(user)
+            self._user_views.pop(user_id, None)
+            self._user_list = None
+            return True
 
     # -- Group management --------------------------------------------------
     def create_group(self, payload: SCIMGroupCreateRequest) -> SCIMGroup:
-        with self._lock:
+        with self._lock.write():
             group_id = str(uuid4())
             group = DirectoryGroup(
                 id=group_id,
                 displayName=payload.displayName,
-                members=payload.members,
+                members=_index_members(payload.members),
             )
             self._groups[group_id] = group
-            return group.to_api()
+            return self._publish_group(group)
 
     def list_groups(self) -> List[SCIMGroup]:
-        with self._lock:
-            return [group.to_api() for group in self._groups.values()]
+        with self._lock.read():
+            if self._group_list is None:
+                self._group_list = [group.to_api() for group in self._groups.values()]
+            return list(self._group_list)
 
     def get_group(self, group_id: str) -> SCIMGroup | None:
-        with self._lock:
-            group = self._groups.get(group_id)
-            return group.to_api() if group else None
+        entry = self.get_group_versioned(group_id)
+        return entry[0] if entry else None
+
+    def get_group_versioned(self, group_id: str) -> tuple[SCIMGroup, int] | None:
+        """Return the group projection with its version, for ETags."""
+
+        return self._current_view(self._groups, self._group_views, self._lock, group_id)
 
     def replace_group(self, group_id: str, payload: SCIMGroupCreateRequest) -> SCIMGroup | None:
-        with self._lock:
-            if group_id not in self._groups:
+        with self._lock.write():
+            group = self._groups.get(group_id)
+            if not group:
                 return None
-            group = DirectoryGroup(id=group_id, displayName=payload.displayName, members=payload.members)
-            self._groups[group_id] = group
-            return group.to_api()
+            group.apply(payload)
+            return self._publish_group(group)
 
     def delete_group(self, group_id: str) -> bool:
-        with self._lock:
-            return self._groups.pop(group_id, None) is not None
+        with self._lock.write():
+            if self._groups.pop(group_id, None) is None:
+                return False
+            self._group_views.pop(group_id, None)
+            self._group_list = None
+            return True
+
+    def add_member_to_group(
+        self, group_id: str, member: SCIMGroupMember, *, return_representation: bool = True
+    ) -> SCIMGroup | PatchResult | None:
+        """Add ``member``; without ``return_representation`` no projection is built."""
 
-    def add_member_to_group(self, group_id: str, member: SCIMGroupMember) -> SCIMGroup | None:
-        with self._lock:
+        with self._lock.write():
             group = self._groups.get(group_id)
             if not group:
                 return None
-            if member not in group.members:
-                group.members.append(member)
-            return group.to_api()
+            changed = group.add_member(member)
+            return self._member_change_result(group, changed, return_representation)
+
+    def remove_member_from_group(
+        self, group_id: str, member_id: str, *, return_representation: bool = True
+    ) -> SCIMGroup | PatchResult | None:
+        """Remove ``member_id``; without ``return_representation`` no projection is built."""
 
-    def remove_member_from_group(self, group_id: str, member_id: str) -> SCIMGroup | None:
-        with self._lock:
+        with self._lock.write():
             group = self._groups.get(group_id)
             if not group:
                 return None
-            group.members = [m for m in group.members if m.value != member_id]
-            return group.to_api()
+            changed = group.remove_member(member_id)
+            return self._member_change_result(group, changed, return_representation)
+
+    def _member_change_result(
+        self, group: DirectoryGroup, changed: bool, return_representation: bool
+    ) -> SCIMGroup | PatchResult:
+        if return_representation:
+            return self._publish_group(group) if changed else group.to_api()
+        if changed:
+            # The version bump marks the view stale; membership bursts rebuild
+            # the projection once, on the next read.
+            self._group_list = None
+        return PatchResult(group.version)
+
+
+@lru_cache(maxsize=1)
+def get_directory() -> InMemoryDirectory:
+    """Return the process-wide directory, created on first use.
+
+    Used as a FastAPI dependency; tests can override it or call
+    ``get_directory.cache_clear()`` for isolation.
+    """
+
+    return InMemoryDirectory()
+
 
+def preload_directory() -> InMemoryDirectory:
+    """Create the directory eagerly, e.g. before workers fork."""
 
-directory = InMemoryDirectory()
+    return get_directory()
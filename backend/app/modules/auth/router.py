@@ -6,7 +6,6 @@ import logging
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from ...core.config import Settings, get_settings
 from ...schemas.health import HealthStatus
 from ...services.access_policies import ObjectRole, policy_engine
 from .schemas import (
@@ -26,7 +25,7 @@ from .schemas import (
     RoleCatalogueEntry,
 )
 from .scim_router import scim_router
-from .services.azure import AzureOAuthClient
+from .services.azure import AzureOAuthClient, get_azure_client
 
 logger = logging.getLogger(__name__)
 
@@ -48,11 +47,10 @@ def healthcheck() -> HealthStatus:
 @router.post("/oauth2/authorize", response_model=AzureOAuthAuthorizeResponse)
 async def oauth_authorize(
     payload: AzureOAuthAuthorizeRequest,
-    settings: Settings = Depends(get_settings),
+    client: AzureOAuthClient = Depends(get_azure_client),
 ) -> AzureOAuthAuthorizeResponse:
     """Return the Azure AD authorize URL for PKCE-based flows."""
 
-    client = AzureOAuthClient(settings)
     url, verifier = client.build_authorization_url(
         state=payload.state,
         nonce=payload.nonce,
@@ -68,11 +66,10 @@ async def oauth_authorize(
 @router.post("/oauth2/token", response_model=AzureOAuthTokenResponse)
 async def oauth_token(
     payload: AzureOAuthTokenRequest,
-    settings: Settings = Depends(get_settings),
+    client: AzureOAuthClient = Depends(get_azure_client),
 ) -> AzureOAuthTokenResponse:
     """Exchange an authorization code for tokens."""
 
-    client = AzureOAuthClient(settings)
     try:
         return await client.exchange_code_for_token(
             code=payload.code,
@@ -90,11 +87,10 @@ async def oauth_token(
 @router.post("/oauth2/refresh", response_model=AzureOAuthTokenResponse)
 async def oauth_refresh(
     payload: AzureOAuthRefreshRequest,
-    settings: Settings = Depends(get_settings),
+    client: AzureOAuthClient = Depends(get_azure_client),
 ) -> AzureOAuthTokenResponse:
     """Refresh an access token using a refresh token."""
 
-    client = AzureOAuthClient(settings)
     try:
         return await client.refresh_access_token(refresh_token=payload.refresh_token)
     except httpx.HTTPStatusError as exc:  # pragma: no cover - passthrough to client
@@ -107,11 +103,10 @@ async def oauth_refresh(
 
 @router.post("/oauth2/logout", response_model=AzureLogoutResponse)
 async def oauth_logout(
-    settings: Settings = Depends(get_settings),
+    client: AzureOAuthClient = Depends(get_azure_client),
 ) -> AzureLogoutResponse:
     """Provide the logout URL for front-channel sign-out."""
 
-    client = AzureOAuthClient(settings)
     return AzureLogoutResponse(logout_url=client.build_logout_url())
 
 
@@ -126,7 +121,7 @@ def assign_role(
         engine.assign_role(payload.user_id, payload.role)
     except KeyError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
-    roles = sorted(engine.get_assignments(payload.user_id))
+    roles = tuple(sorted(engine.get_assignments(payload.user_id)))
     return AccessAssignmentResponse(user_id=payload.user_id, roles=roles)
 
 
@@ -138,7 +133,7 @@ def revoke_role(
     """Revoke a role from a user."""
 
     engine.revoke_role(payload.user_id, payload.role)
-    roles = sorted(engine.get_assignments(payload.user_id))
+    roles = tuple(sorted(engine.get_assignments(payload.user_id)))
     return AccessAssignmentResponse(user_id=payload.user_id, roles=roles)
 
 
@@ -150,7 +145,7 @@ def assign_object_role(
     """Assign an object-level role to a user."""
 
     engine.grant_object_role(payload.user_id, payload.object_id, payload.role)
-    roles = sorted(engine.get_assignments(payload.user_id))
+    roles = tuple(sorted(engine.get_assignments(payload.user_id)))
     return AccessAssignmentResponse(user_id=payload.user_id, roles=roles)
 
 
@@ -162,7 +157,7 @@ def evaluate_access(
     """Evaluate whether the supplied action is permitted."""
 
     context = payload.context.to_domain()
-    resource_attributes = payload.resource.to_attributes() if payload.resource else {}
+    resource_attributes = payload.resource.attributes_view if payload.resource else {}
     decision, permissions = engine.is_action_allowed(
         user_id=context.user_id,
         action=payload.action,
@@ -170,7 +165,7 @@ def evaluate_access(
         resource_attributes=resource_attributes,
         object_roles=payload.object_roles,
     )
-    return AccessEvaluationResponse(decision=decision, permissions=sorted(permissions))
+    return AccessEvaluationResponse(decision=decision, permissions=tuple(sorted(permissions)))
 
 
 @router.get("/roles/catalogue", response_model=list[RoleCatalogueEntry])
@@ -182,32 +177,36 @@ def list_roles(engine=Depends(_get_policy_engine)) -> list[RoleCatalogueEntry]:
         entries.append(
             RoleCatalogueEntry(
                 name=role.name,
-                permissions=sorted(role.permissions),
-                implied_roles=sorted(role.implied_roles),
+                permissions=tuple(sorted(role.permissions)),
+                implied_roles=tuple(sorted(role.implied_roles)),
             )
         )
     return entries
 
 
+_EXAMPLE_PAYLOAD = AccessEvaluationRequest(
+    action="workflow:approve",
+    context=AccessContextModel(
+        user_id="user-1",
+        tenant_id="tenant-1",
+        workspace_ids=["workspace-1"],
+        manager_of=["user-2"],
+        labels=["okr-expert"],
+    ),
+    resource=AccessResourceModel(
+        id="objective-1",
+        workspace_ids=["workspace-1"],
+        owner_id="user-2",
+    ),
+    object_roles=[ObjectRole.APPROVER],
+)
+
+
 @router.get("/roles/decision-examples", response_model=list[AccessEvaluationResponse])
 def decision_examples(engine=Depends(_get_policy_engine)) -> list[AccessEvaluationResponse]:
     """Return canned examples showing RBAC + ABAC + object-role interplay."""
 
-    example_payload = AccessEvaluationRequest(
-        action="workflow:approve",
-        context=AccessContextModel(
-            user_id="user-1",
-            tenant_id="tenant-1",
-            workspace_ids=["workspace-1"],
-            manager_of=["user-2"],
-            labels=["okr-expert"],
-        ),
-        resource=AccessResourceModel(
-            id="objective-1",
-            workspace_ids=["workspace-1"],
-            owner_id="user-2",
-        ),
-        object_roles=[ObjectRole.APPROVER],
-    )
-    result = evaluate_access(example_payload, engine)
+    # Only the request is fixed; role assignments can change, so the decision
+    # is evaluated on every call.
+    result = evaluate_access(_EXAMPLE_PAYLOAD, engine)
     return [result]
@@ -1,9 +1,12 @@
 """Pydantic schemas for the Auth module."""
 from __future__ import annotations
 
-from typing import List, Sequence
+import sys
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Generic, List, Mapping, Sequence, Tuple, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from ...services.access_policies import AccessDecision, AccessContext, ObjectRole
 
@@ -49,7 +52,14 @@ class AzureLogoutResponse(BaseModel):
     logout_url: str
 
 
+def _interned_set(values: Sequence[str]) -> frozenset[str]:
+    return frozenset(sys.intern(value) for value in values)
+
+
 class AccessContextModel(BaseModel):
+    # Frozen so the cached frozensets below can never go stale.
+    model_config = ConfigDict(frozen=True)
+
     user_id: str
     tenant_id: str
     workspace_ids: List[str] = Field(default_factory=list)
@@ -59,26 +69,46 @@ class AccessContextModel(BaseModel):
     level: str | None = None
     attributes: dict[str, Sequence[str] | str] = Field(default_factory=dict)
 
+    @cached_property
+    def workspace_ids_fs(self) -> frozenset[str]:
+        return _interned_set(self.workspace_ids)
+
+    @cached_property
+    def manager_of_fs(self) -> frozenset[str]:
+        return _interned_set(self.manager_of)
+
+    @cached_property
+    def labels_fs(self) -> frozenset[str]:
+        return _interned_set(self.labels)
+
+    @cached_property
+    def ad_groups_fs(self) -> frozenset[str]:
+        return _interned_set(self.ad_groups)
+
     def to_domain(self) -> AccessContext:
         return AccessContext(
             user_id=self.user_id,
             tenant_id=self.tenant_id,
-            workspace_ids=frozenset(self.workspace_ids),
-            manager_of=frozenset(self.manager_of),
-            labels=frozenset(self.labels),
-            ad_groups=frozenset(self.ad_groups),
+            workspace_ids=self.workspace_ids_fs,
+            manager_of=self.manager_of_fs,
+            labels=self.labels_fs,
+            ad_groups=self.ad_groups_fs,
             level=self.level,
             attributes=self.attributes,
         )
 
 
 class AccessResourceModel(BaseModel):
+    # Frozen so the cached attribute view below can never go stale.
+    model_config = ConfigDict(frozen=True)
+
     id: str | None = None
     workspace_ids: List[str] = Field(default_factory=list)
     owner_id: str | None = None
     attributes: dict[str, Sequence[str] | str] = Field(default_factory=dict)
 
-    def to_attributes(self) -> dict[str, Sequence[str] | str]:
+    @cached_property
+    def attributes_view(self) -> Mapping[str, Sequence[str] | str]:
         payload: dict[str, Sequence[str] | str] = {
             "workspace_ids": self.workspace_ids,
         }
@@ -87,7 +117,7 @@ class AccessResourceModel(BaseModel):
             payload["id"] = self.id
         if self.owner_id:
             payload["owner_id"] = self.owner_id
-        return payload
+        return MappingProxyType(payload)
 
 
 class RoleAssignmentRequest(BaseModel):
@@ -110,35 +140,53 @@ class AccessEvaluationRequest(BaseModel):
 
 class AccessEvaluationResponse(BaseModel):
     decision: AccessDecision
-    permissions: List[str]
+    permissions: Tuple[str, ...]
 
 
 class AccessAssignmentResponse(BaseModel):
     user_id: str
-    roles: List[str]
+    roles: Tuple[str, ...]
 
 
 class RoleCatalogueEntry(BaseModel):
     name: str
-    permissions: List[str]
-    implied_roles: List[str]
+    permissions: Tuple[str, ...]
+    implied_roles: Tuple[str, ...]
 
 
 # -- SCIM schemas ----------------------------------------------------------
 
 
-class SCIMName(BaseModel):
+# Upper bound on operations accepted in one SCIM PATCH request.
+MAX_PATCH_OPERATIONS = 1000
+
+# Immutable defaults shared by every response instance.
+LIST_RESPONSE_SCHEMAS: Tuple[str, ...] = ("urn:ietf:params:scim:api:messages:2.0:ListResponse",)
+ERROR_RESPONSE_SCHEMAS: Tuple[str, ...] = ("urn:ietf:params:scim:api:messages:2.0:Error",)
+
+# Incoming PATCH ops are case-folded and interned on parse, so a "replace" op
+# is this very object and compares by identity before any character check.
+SCIM_OP_REPLACE = sys.intern("replace")
+
+
+class SCIMModel(BaseModel):
+    """Shared configuration for SCIM payloads; unknown attributes are ignored."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class SCIMName(SCIMModel):
     givenName: str | None = None
     familyName: str | None = None
 
 
-class SCIMEmail(BaseModel):
+class SCIMEmail(SCIMModel):
     value: str
     primary: bool = True
     type: str | None = "work"
 
 
-class SCIMUser(BaseModel):
+class SCIMUser(SCIMModel):
     id: str
     userName: str
     active: bool = True
@@ -148,26 +196,35 @@ class SCIMUser(BaseModel):
     externalId: str | None = None
 
 
-class SCIMGroupMember(BaseModel):
+class SCIMGroupMember(SCIMModel):
     value: str
     display: str | None = None
 
 
-class SCIMGroup(BaseModel):
+class SCIMGroup(SCIMModel):
     id: str
     displayName: str
     members: List[SCIMGroupMember] = Field(default_factory=list)
 
 
-class SCIMListResponse(BaseModel):
-    Resources: List[dict]
+ResourceT = TypeVar("ResourceT", bound=SCIMModel)
+
+
+class SCIMListResponse(SCIMModel, Generic[ResourceT]):
+    Resources: List[ResourceT]
     totalResults: int
     itemsPerPage: int
     startIndex: int = 1
-    schemas: List[str] = Field(default_factory=lambda: ["urn:ietf:params:scim:api:messages:2.0:ListResponse"])
+    schemas: Tuple[str, ...] = LIST_RESPONSE_SCHEMAS
+
+
+# Parametrised once; ``SCIMListResponse[...]`` otherwise goes through pydantic's
+# generic cache lookup on every request.
+SCIMUserListResponse = SCIMListResponse[SCIMUser]
+SCIMGroupListResponse = SCIMListResponse[SCIMGroup]
 
 
-class SCIMUserCreateRequest(BaseModel):
+class SCIMUserCreateRequest(SCIMModel):
     userName: str
     active: bool = True
     displayName: str | None = None
@@ -176,23 +233,37 @@ class SCIMUserCreateRequest(BaseModel):
     externalId: str | None = None
 
 
-class SCIMUserPatchOperation(BaseModel):
+class SCIMUserPatchOperation(SCIMModel):
     op: str
     path: str | None = None
     value: dict | bool | str | list | None = None
 
+    @field_validator("op")
+    @classmethod
+    def normalise_op(cls, value: str) -> str:
+        # SCIM op names are case-insensitive ("Replace", "replace").
+        return sys.intern(value.lower())
 
-class SCIMPatchRequest(BaseModel):
+
+class SCIMPatchRequest(SCIMModel):
     schemas: List[str]
     Operations: List[SCIMUserPatchOperation]
 
+    @field_validator("Operations", mode="before")
+    @classmethod
+    def limit_operations(cls, value: Any) -> Any:
+        # Reject oversized payloads before validating every operation.
+        if isinstance(value, (list, tuple)) and len(value) > MAX_PATCH_OPERATIONS:
+            raise ValueError(f"at most {MAX_PATCH_OPERATIONS} operations are allowed per request")
+        return value
+
 
-class SCIMGroupCreateRequest(BaseModel):
+class SCIMGroupCreateRequest(SCIMModel):
     displayName: str
     members: List[SCIMGroupMember] = Field(default_factory=list)
 
 
-class SCIMErrorResponse(BaseModel):
+class SCIMErrorResponse(SCIMModel):
     detail: str
     status: int
-    schemas: List[str] = Field(default_factory=lambda: ["urn:ietf:params:scim:api:messages:2.0:Error"])
+    schemas: Tuple[str, ...] = ERROR_RESPONSE_SCHEMAS
@@ -1,125 +1,362 @@
 """SCIM 2.0 provisioning endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Response, status
-from fastapi.responses import JSONResponse
+import json
+import re
+from typing import Any, Awaitable, Callable, Coroutine, Dict, TypeVar
 
-from .directory import directory
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+
+from .directory import InMemoryDirectory, PatchResult, get_directory
 from .schemas import (
     SCIMErrorResponse,
     SCIMGroup,
     SCIMGroupCreateRequest,
+    SCIMGroupListResponse,
     SCIMGroupMember,
-    SCIMListResponse,
     SCIMPatchRequest,
     SCIMUser,
     SCIMUserCreateRequest,
+    SCIMUserListResponse,
 )
 
-scim_router = APIRouter(prefix="/scim/v2", tags=["scim"])
 
+# The body never varies, so it is serialised once instead of dumped per error.
+_INTERNAL_ERROR_BODY = to_json(SCIMErrorResponse(detail="Internal Server Error", status=500))
+
+
+def scim_exception_handler(_: Exception) -> Response:
+    """Return RFC compliant error structures for unexpected issues."""
+
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        media_type="application/json",
+    )
+
+
+def _model_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize a response model straight to JSON bytes.
+
+    Returning a ``Response`` skips FastAPI's response_model round trip (validate,
+    dump to dicts, encode); ``response_model`` stays on the routes for OpenAPI.
+    """
+
+    return Response(content=to_json(model), status_code=status_code, media_type="application/json")
+
+
+def _weak_etag(version: int) -> str:
+    return f'W/"{version}"'
+
+
+def _versioned_response(request: Request, model: BaseModel, version: int) -> Response:
+    """Serve a directory resource with a weak ETag built from its row version."""
+
+    etag = _weak_etag(version)
+    headers = {"ETag": etag}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response = _model_response(model)
+    response.headers.update(headers)
+    return response
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _json_body(model: type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """Dependency validating the raw request body as ``model`` in one pass.
 
-@scim_router.get("/Users", response_model=SCIMListResponse)
-def list_users() -> SCIMListResponse:
-    users = [user.dict() for user in directory.list_users()]
-    return SCIMListResponse(Resources=users, totalResults=len(users), itemsPerPage=len(users))
+    FastAPI would ``json.loads`` the body into dicts and validate those;
+    ``model_validate_json`` parses the bytes directly with pydantic's parser.
+    """
+
+    async def parse_body(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            errors = [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+            raise RequestValidationError(errors) from exc
+
+    return parse_body
+
+
+def _body_openapi(model: type[BaseModel]) -> Dict[str, Any]:
+    """``openapi_extra`` documenting a body read by :func:`_json_body`."""
+
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if ref is not None:
+                return inline(definitions[ref.rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}},
+        }
+    }
+
+
+# The filter identity providers send before provisioning a user. Anything else
+# is rejected rather than answered with an unfiltered listing.
+_USER_NAME_EQ_FILTER = re.compile(r'^\s*userName\s+eq\s+("(?:[^"\\]|\\.)*")\s*$', re.IGNORECASE)
+
+
+def _parse_user_name_filter(expression: str) -> str:
+    match = _USER_NAME_EQ_FILTER.match(expression)
+    if match is not None:
+        try:
+            # SCIM filter string literals use JSON escaping.
+            return json.loads(match.group(1))
+        except ValueError:
+            pass
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail='Unsupported filter; only userName eq "<value>" is supported',
+    )
+
+
+def _prefers_minimal(request: Request) -> bool:
+    """Whether the client sent ``Prefer: return=minimal`` (RFC 7240)."""
+
+    prefer = request.headers.get("prefer")
+    return prefer is not None and "return=minimal" in prefer.replace(" ", "").lower()
+
+
+def _member_change_response(result: SCIMGroup | PatchResult | None) -> Response:
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    if isinstance(result, PatchResult):
+        # Nothing is serialised; the ETag still lets clients revalidate caches.
+        return Response(
+            status_code=status.HTTP_204_NO_CONTENT, headers={"ETag": _weak_etag(result.version)}
+        )
+    return _model_response(result)
+
+
+class SCIMRoute(APIRoute):
+    """Route class mapping unexpected errors to SCIM error payloads.
+
+    ``APIRouter`` has no exception handler hook, so this stays scoped to the
+    SCIM routes instead of registering a catch-all on the application.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def scim_route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            except (HTTPException, RequestValidationError):
+                raise
+            except Exception as exc:
+                return scim_exception_handler(exc)
+
+        return scim_route_handler
+
+
+scim_router = APIRouter(
+    prefix="/scim/v2",
+    tags=["scim"],
+    route_class=SCIMRoute,
+)
+
+
+@scim_router.get("/Users", response_model=SCIMUserListResponse)
+def list_users(
+    filter: str | None = Query(None, description='SCIM filter; only userName eq "<value>" is supported'),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    if filter is None:
+        users = directory.list_users()
+    else:
+        users = directory.find_users_by_username(_parse_user_name_filter(filter))
+    count = len(users)
+    # The directory's projections are already validated models.
+    return _model_response(
+        SCIMUserListResponse.model_construct(Resources=users, totalResults=count, itemsPerPage=count)
+    )
 
 
 @scim_router.post(
     "/Users",
     response_model=SCIMUser,
     status_code=status.HTTP_201_CREATED,
+    openapi_extra=_body_openapi(SCIMUserCreateRequest),
 )
-def create_user(payload: SCIMUserCreateRequest) -> SCIMUser:
-    return directory.create_user(payload)
+def create_user(
+    payload: SCIMUserCreateRequest = Depends(_json_body(SCIMUserCreateRequest)),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    return _model_response(directory.create_user(payload), status.HTTP_201_CREATED)
 
 
 @scim_router.get("/Users/{user_id}", response_model=SCIMUser)
-def get_user(user_id: str) -> SCIMUser:
-    user = directory.get_user(user_id)
-    if not user:
+def get_user(
+    user_id: str,
+    request: Request,
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    entry = directory.get_user_versioned(user_id)
+    if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+    return _versioned_response(request, *entry)
 
 
-@scim_router.put("/Users/{user_id}", response_model=SCIMUser)
-def replace_user(user_id: str, payload: SCIMUserCreateRequest) -> SCIMUser:
+@scim_router.put(
+    "/Users/{user_id}",
+    response_model=SCIMUser,
+    openapi_extra=_body_openapi(SCIMUserCreateRequest),
+)
+def replace_user(
+    user_id: str,
+    payload: SCIMUserCreateRequest = Depends(_json_body(SCIMUserCreateRequest)),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
     user = directory.replace_user(user_id, payload)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+    return _model_response(user)
 
 
-@scim_router.patch("/Users/{user_id}", response_model=SCIMUser)
-def patch_user(user_id: str, payload: SCIMPatchRequest) -> SCIMUser:
-    user = directory.patch_user(user_id, [op.dict(exclude_none=True) for op in payload.Operations])
+@scim_router.patch(
+    "/Users/{user_id}",
+    response_model=SCIMUser,
+    openapi_extra=_body_openapi(SCIMPatchRequest),
+)
+def patch_user(
+    user_id: str,
+    payload: SCIMPatchRequest = Depends(_json_body(SCIMPatchRequest)),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    user = directory.patch_user(user_id, payload.Operations)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user
+    return _model_response(user)
 
 
 @scim_router.delete("/Users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: str) -> Response:
+def delete_user(
+    user_id: str,
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
     if not directory.delete_user(user_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@scim_router.get("/Groups", response_model=SCIMListResponse)
-def list_groups() -> SCIMListResponse:
-    groups = [group.dict() for group in directory.list_groups()]
-    return SCIMListResponse(Resources=groups, totalResults=len(groups), itemsPerPage=len(groups))
+@scim_router.get("/Groups", response_model=SCIMGroupListResponse)
+def list_groups(
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    groups = directory.list_groups()
+    count = len(groups)
+    return _model_response(
+        SCIMGroupListResponse.model_construct(Resources=groups, totalResults=count, itemsPerPage=count)
+    )
 
 
-@scim_router.post("/Groups", response_model=SCIMGroup, status_code=status.HTTP_201_CREATED)
-def create_group(payload: SCIMGroupCreateRequest) -> SCIMGroup:
-    return directory.create_group(payload)
+@scim_router.post(
+    "/Groups",
+    response_model=SCIMGroup,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_body_openapi(SCIMGroupCreateRequest),
+)
+def create_group(
+    payload: SCIMGroupCreateRequest = Depends(_json_body(SCIMGroupCreateRequest)),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    return _model_response(directory.create_group(payload), status.HTTP_201_CREATED)
 
 
 @scim_router.get("/Groups/{group_id}", response_model=SCIMGroup)
-def get_group(group_id: str) -> SCIMGroup:
-    group = directory.get_group(group_id)
-    if not group:
+def get_group(
+    group_id: str,
+    request: Request,
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    entry = directory.get_group_versioned(group_id)
+    if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    return group
+    return _versioned_response(request, *entry)
 
 
-@scim_router.put("/Groups/{group_id}", response_model=SCIMGroup)
-def replace_group(group_id: str, payload: SCIMGroupCreateRequest) -> SCIMGroup:
+@scim_router.put(
+    "/Groups/{group_id}",
+    response_model=SCIMGroup,
+    openapi_extra=_body_openapi(SCIMGroupCreateRequest),
+)
+def replace_group(
+    group_id: str,
+    payload: SCIMGroupCreateRequest = Depends(_json_body(SCIMGroupCreateRequest)),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
     group = directory.replace_group(group_id, payload)
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    return group
+    return _model_response(group)
 
 
 @scim_router.delete("/Groups/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_group(group_id: str) -> Response:
+def delete_group(
+    group_id: str,
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
     if not directory.delete_group(group_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@scim_router.post("/Groups/{group_id}/members", response_model=SCIMGroup)
-def add_group_member(group_id: str, member: SCIMGroupMember) -> SCIMGroup:
-    group = directory.add_member_to_group(group_id, member)
-    if not group:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    return group
-
-
-@scim_router.delete("/Groups/{group_id}/members/{member_id}", response_model=SCIMGroup)
-def remove_group_member(group_id: str, member_id: str) -> SCIMGroup:
-    group = directory.remove_member_from_group(group_id, member_id)
-    if not group:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
-    return group
-
-
-@scim_router.exception_handler(Exception)
-async def scim_exception_handler(_: Exception) -> JSONResponse:
-    """Return RFC compliant error structures for unexpected issues."""
-
-    error = SCIMErrorResponse(detail="Internal Server Error", status=500)
-    return JSONResponse(status_code=500, content=error.dict())
+@scim_router.post(
+    "/Groups/{group_id}/members",
+    response_model=SCIMGroup,
+    responses={status.HTTP_204_NO_CONTENT: {"description": "Sent for Prefer: return=minimal"}},
+    openapi_extra=_body_openapi(SCIMGroupMember),
+)
+def add_group_member(
+    group_id: str,
+    request: Request,
+    member: SCIMGroupMember = Depends(_json_body(SCIMGroupMember)),
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    return _member_change_response(
+        directory.add_member_to_group(
+            group_id, member, return_representation=not _prefers_minimal(request)
+        )
+    )
+
+
+@scim_router.delete(
+    "/Groups/{group_id}/members/{member_id}",
+    response_model=SCIMGroup,
+    responses={status.HTTP_204_NO_CONTENT: {"description": "Sent for Prefer: return=minimal"}},
+)
+def remove_group_member(
+    group_id: str,
+    member_id: str,
+    request: Request,
+    directory: InMemoryDirectory = Depends(get_directory),
+) -> Response:
+    return _member_change_response(
+        directory.remove_member_from_group(
+            group_id, member_id, return_representation=not _prefers_minimal(request)
+        )
+    )
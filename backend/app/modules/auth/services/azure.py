@@ -3,13 +3,14 @@ from __future__ import annotations
 
 import base64
 import hashlib
-import os
+import secrets
+from functools import lru_cache
 from typing import Iterable
 from urllib.parse import urlencode
 
 import httpx
 
-from ....core.config import Settings
+from ....core.config import Settings, get_settings
 from ..schemas import AzureOAuthTokenResponse
 
 
@@ -20,10 +21,64 @@ class AzureOAuthClient:
     token_path = "/oauth2/v2.0/token"
     logout_path = "/oauth2/v2.0/logout"
 
+    # Keep-alive connections to the authority are reused across token calls.
+    http_limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    http_timeout = 20.0
+
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
+        self._http: httpx.AsyncClient | None = None
+        authority = settings.azure_authority
+        self._authorize_url = f"{authority}{self.authorize_path}"
+        self._token_url = f"{authority}{self.token_path}"
+        self._logout_url = f"{authority}{self.logout_path}"
+        # Form fields shared by every token request; copied before use.
+        self._base_token_body = {
+            "client_id": settings.azure_client_id,
+            "scope": settings.azure_oauth_scopes,
+        }
+        if settings.azure_client_secret:
+            self._base_token_body["client_secret"] = settings.azure_client_secret
+        # Query prefixes for the default scopes and redirect URIs; only the
+        # per-request parameters are encoded on each call.
+        self._default_scopes = settings.azure_oauth_scopes.split()
+        self._default_redirect = str(settings.azure_redirect_uri_frontend)
+        self._authorize_query = self._encode_authorize_query(
+            " ".join(self._default_scopes), self._default_redirect
+        )
+        self._logout_query = urlencode(
+            {
+                "post_logout_redirect_uri": str(settings.azure_logout_redirect_uri),
+                "client_id": settings.azure_client_id,
+            }
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # No await between the check and the assignment, so coroutines on the
+        # event loop cannot race to create two clients.
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self.http_timeout, limits=self.http_limits)
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close pooled connections; called on application shutdown."""
+
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     # -- Authorization helpers ---------------------------------------------
+    def _encode_authorize_query(self, scope: str, redirect_uri: str) -> str:
+        return urlencode(
+            {
+                "client_id": self.settings.azure_client_id,
+                "response_type": "code",
+                "redirect_uri": redirect_uri,
+                "response_mode": "query",
+                "scope": scope,
+            }
+        )
+
     def build_authorization_url(
         self,
         state: str,
@@ -36,16 +91,12 @@ class AzureOAuthClient:
     ) -> tuple[str, str | None]:
         """Return the authorization URL and optional PKCE verifier."""
 
-        effective_scopes = " ".join(scopes or self.settings.azure_oauth_scopes.split())
-        redirect = redirect_uri or str(self.settings.azure_redirect_uri_frontend)
-        query = {
-            "client_id": self.settings.azure_client_id,
-            "response_type": "code",
-            "redirect_uri": redirect,
-            "response_mode": "query",
-            "scope": effective_scopes,
-            "state": state,
-        }
+        static_query = self._authorize_query
+        if scopes or redirect_uri:
+            static_query = self._encode_authorize_query(
+                " ".join(scopes or self._default_scopes), redirect_uri or self._default_redirect
+            )
+        query = {"state": state}
         if nonce:
             query["nonce"] = nonce
         verifier = code_verifier
@@ -57,7 +108,7 @@ class AzureOAuthClient:
             query["code_challenge_method"] = code_challenge_method
 
         return (
-            f"{self.settings.azure_authority}{self.authorize_path}?{urlencode(query)}",
+            f"{self._authorize_url}?{static_query}&{urlencode(query)}",
             verifier,
         )
 
@@ -69,68 +120,69 @@ class AzureOAuthClient:
     ) -> AzureOAuthTokenResponse:
         """Exchange an authorization code for Azure AD tokens."""
 
-        data = {
-            "client_id": self.settings.azure_client_id,
-            "scope": self.settings.azure_oauth_scopes,
-            "code": code,
-            "redirect_uri": redirect_uri,
-            "grant_type": "authorization_code",
-        }
+        data = self._base_token_body.copy()
+        data["code"] = code
+        data["redirect_uri"] = redirect_uri
+        data["grant_type"] = "authorization_code"
         if code_verifier:
             data["code_verifier"] = code_verifier
-        if self.settings.azure_client_secret:
-            data["client_secret"] = self.settings.azure_client_secret
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.settings.azure_authority}{self.token_path}",
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=20.0,
-            )
-            response.raise_for_status()
-            payload = response.json()
+
+        response = await self._get_http_client().post(
+            self._token_url,
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        response.raise_for_status()
+        payload = response.json()
         return AzureOAuthTokenResponse.parse_obj(payload)
 
     async def refresh_access_token(self, refresh_token: str) -> AzureOAuthTokenResponse:
         """Refresh an Azure AD access token."""
 
-        data = {
-            "client_id": self.settings.azure_client_id,
-            "scope": self.settings.azure_oauth_scopes,
-            "refresh_token": refresh_token,
-            "grant_type": "refresh_token",
-        }
-        if self.settings.azure_client_secret:
-            data["client_secret"] = self.settings.azure_client_secret
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.settings.azure_authority}{self.token_path}",
-                data=data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=20.0,
-            )
-            response.raise_for_status()
-            payload = response.json()
+        data = self._base_token_body.copy()
+        data["refresh_token"] = refresh_token
+        data["grant_type"] = "refresh_token"
+
+        response = await self._get_http_client().post(
+            self._token_url,
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        response.raise_for_status()
+        payload = response.json()
         return AzureOAuthTokenResponse.parse_obj(payload)
 
     def build_logout_url(self, post_logout_redirect_uri: str | None = None) -> str:
         """Construct the Azure logout endpoint for front-channel sign-out."""
 
-        redirect = post_logout_redirect_uri or str(self.settings.azure_logout_redirect_uri)
-        query = {"post_logout_redirect_uri": redirect, "client_id": self.settings.azure_client_id}
-        return f"{self.settings.azure_authority}{self.logout_path}?{urlencode(query)}"
+        if not post_logout_redirect_uri:
+            return f"{self._logout_url}?{self._logout_query}"
+        query = {
+            "post_logout_redirect_uri": post_logout_redirect_uri,
+            "client_id": self.settings.azure_client_id,
+        }
+        return f"{self._logout_url}?{urlencode(query)}"
+
+
+@lru_cache(maxsize=1)
+def get_azure_client() -> AzureOAuthClient:
+    """Return the process-wide Azure client (FastAPI dependency)."""
+
+    return AzureOAuthClient(get_settings())
+
+
+def _b64url_nopad(data: bytes) -> str:
+    # Strip padding on the bytes so only one str is allocated.
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
 
 def generate_pkce_verifier(length: int = 64) -> str:
     """Create a high-entropy code verifier for PKCE flows."""
 
-    return base64.urlsafe_b64encode(os.urandom(length)).decode("utf-8").rstrip("=")
+    return secrets.token_urlsafe(length)
 
 
 def build_pkce_challenge(code_verifier: str) -> str:
     """Derive the S256 challenge from the code verifier."""
 
-    digest = hashlib.sha256(code_verifier.encode("utf-8")).digest()
-    return base64.urlsafe_b64encode(digest).decode("utf-8").rstrip("=")
+    return _b64url_nopad(hashlib.sha256(code_verifier.encode("utf-8")).digest())
@@ -9,7 +9,7 @@ from .exceptions import (
     DataConnectorOperationalError,
     DataConnectorReadOnlyViolation,
 )
-from .journal import DataSelectionJournal
+from .journal import DataSelectionJournal, JournalSink
 from .models import DataSelectionLog, DataSelectionStatus
 from .ms_graph_excel import MicrosoftGraphExcelConnector
 from .postgres import PostgresReadOnlyConnector
@@ -18,6 +18,7 @@ __all__ = [
     "DataConnector",
     "DataSelectionResult",
     "DataSelectionJournal",
+    "JournalSink",
     "DataSelectionLog",
     "DataSelectionStatus",
     "MicrosoftGraphExcelConnector",
@@ -6,19 +6,20 @@ from dataclasses import dataclass, field
 from typing import Any, Callable
 
 from .exceptions import DataConnectorError, DataConnectorOperationalError
-from .journal import DataSelectionJournal
+from .journal import DataSelectionJournal, get_journal_sink
 
 
-@dataclass
+@dataclass(slots=True)
 class DataSelectionResult:
     """Normalized payload returned by connector queries."""
 
     records: list[Any]
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Counted once; records are not mutated after construction.
+    row_count: int = field(init=False)
 
-    @property
-    def row_count(self) -> int:
-        return len(self.records)
+    def __post_init__(self) -> None:
+        self.row_count = len(self.records)
 
 
 class DataConnector(ABC):
@@ -27,7 +28,7 @@ class DataConnector(ABC):
     operation_name: str = "query"
 
     def __init__(self, *, journal: DataSelectionJournal | None = None) -> None:
-        self._journal = journal or DataSelectionJournal()
+        self._journal = journal or DataSelectionJournal(sink=get_journal_sink())
 
     @property
     def connector_type(self) -> str:
@@ -1,11 +1,21 @@
 """Utilities for persisting connector execution logs."""
 from __future__ import annotations
 
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
 from contextlib import contextmanager
 from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache, partial
 from typing import Any, Callable, ContextManager
-from uuid import UUID
+from uuid import UUID, uuid4
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.core.database import db
@@ -14,13 +24,140 @@ from .models import DataSelectionLog, DataSelectionStatus
 
 SessionFactory = Callable[[], ContextManager[Session]]
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+def _insert_rows(session_factory: SessionFactory, rows: list[dict[str, Any]]) -> None:
+    # Core INSERT: no identity map or unit-of-work flush for rows that are
+    # never read back. Several rows go out as one executemany.
+    with session_factory() as session:
+        session.execute(insert(DataSelectionLog), rows)
+
+
+class JournalSink:
+    """Write finished journal rows in batches from a background thread.
+
+    Connector calls only enqueue a row; the writer drains up to
+    ``max_batch`` rows or waits ``flush_interval`` seconds for more before
+    issuing a single INSERT. Audit rows are best effort: a failed batch is
+    logged and dropped rather than surfaced to the connector caller.
+
+    A forked child (Celery prefork, ``gunicorn --preload``) inherits the
+    parent's thread object but not the running thread; the sink resets its
+    queue, lock and writer in the child so it starts a writer of its own.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        session_factory: SessionFactory | None = None,
+        *,
+        max_batch: int = 500,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self._session_factory = session_factory or db.session
+        self._max_batch = max_batch
+        self._flush_interval = flush_interval
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        # Weak, so registering does not keep discarded sinks alive.
+        os.register_at_fork(after_in_child=partial(_reset_after_fork, weakref.ref(self)))
+
+    def submit(self, row: dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        self._queue.put(row)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Flush queued rows and stop the writer thread."""
+
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join(timeout)
+
+    def _after_fork(self) -> None:
+        # Rows queued in the parent are the parent's to write; the lock may
+        # have been held by a parent thread at fork time.
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="data-selection-journal", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                _insert_rows(self._session_factory, batch)
+            except Exception:
+                logger.exception("Dropped %d data selection log rows", len(batch))
+
+
+def _reset_after_fork(ref: weakref.ReferenceType[JournalSink]) -> None:
+    sink = ref()
+    if sink is not None:
+        sink._after_fork()
+
+
+@lru_cache(maxsize=1)
+def get_journal_sink() -> JournalSink:
+    """Return the process-wide journal sink, flushed at interpreter exit.
+
+    atexit does not run in Celery prefork children (billiard ends them with
+    ``os._exit``); the worker flushes through :func:`close_journal_sink` on
+    ``worker_process_shutdown`` instead.
+    """
+
+    sink = JournalSink()
+    atexit.register(sink.close)
+    return sink
+
+
+def close_journal_sink() -> None:
+    """Flush and stop the process-wide sink if this process created one."""
+
+    if get_journal_sink.cache_info().currsize:
+        get_journal_sink().close()
+
+
+@dataclass(slots=True)
 class JournalRecordContext:
     """Mutable context passed to connector operations for logging."""
 
     journal: "DataSelectionJournal"
     entry_id: UUID
+    started_at: datetime
+    # Monotonic start for duration_ms; started_at is wall clock for display.
+    started_ns: int
+    # Column values known when the operation starts.
+    values: dict[str, Any]
     completed: bool = field(default=False, init=False)
 
     def succeed(
@@ -34,7 +171,7 @@ class JournalRecordContext:
         """Mark the execution as successful (optionally via fail-safe)."""
 
         self.journal.finalise(
-            self.entry_id,
+            self,
             DataSelectionStatus.FAIL_SAFE if fail_safe else DataSelectionStatus.SUCCESS,
             row_count=row_count,
             details=details,
@@ -47,7 +184,7 @@ class JournalRecordContext:
         """Mark the execution as failed."""
 
         self.journal.finalise(
-            self.entry_id,
+            self,
             DataSelectionStatus.FAILURE,
             row_count=None,
             details=details,
@@ -58,10 +195,24 @@ class JournalRecordContext:
 
 
 class DataSelectionJournal:
-    """Persist execution metadata for connector data selections."""
+    """Persist execution metadata for connector data selections.
+
+    The entry is kept in memory while the operation runs and written once,
+    complete, when it finishes; no connection is held across the connector
+    call. With a ``sink`` the write leaves the caller's thread entirely.
+
+    Operations that are still in flight, or whose process dies before they
+    finish, therefore leave no row in ``data_selection_logs``.
+    """
 
-    def __init__(self, session_factory: SessionFactory | None = None) -> None:
+    def __init__(
+        self,
+        session_factory: SessionFactory | None = None,
+        *,
+        sink: JournalSink | None = None,
+    ) -> None:
         self._session_factory = session_factory or db.session
+        self._sink = sink
 
     @contextmanager
     def record(
@@ -72,18 +223,19 @@ class DataSelectionJournal:
         source: str,
         parameters: dict[str, Any] | None = None,
     ) -> JournalRecordContext:
-        """Create a log entry and yield a context for completion updates."""
-
-        entry = DataSelectionLog(
-            connector_type=connector_type,
-            operation=operation,
-            source=source,
-            parameters=parameters,
-        )
-        with self._session_factory() as session:
-            session.add(entry)
+        """Start a log entry and yield a context for completion updates."""
 
-        context = JournalRecordContext(self, entry.id)
+        entry_id = uuid4()
+        started_at = datetime.now(timezone.utc)
+        values = {
+            "id": entry_id,
+            "connector_type": connector_type,
+            "operation": operation,
+            "source": source,
+            "parameters": parameters,
+            "started_at": started_at,
+        }
+        context = JournalRecordContext(self, entry_id, started_at, time.monotonic_ns(), values)
         try:
             yield context
         except Exception as exc:  # pragma: no cover - defensive branch
@@ -96,7 +248,7 @@ class DataSelectionJournal:
 
     def finalise(
         self,
-        entry_id: UUID,
+        context: JournalRecordContext,
         status: DataSelectionStatus,
         *,
         row_count: int | None,
@@ -104,17 +256,19 @@ class DataSelectionJournal:
         error_message: str | None,
         fail_safe_triggered: bool,
     ) -> None:
-        """Update the stored entry with execution outcome."""
-
-        with self._session_factory() as session:
-            log_entry = session.get(DataSelectionLog, entry_id)
-            if log_entry is None:  # pragma: no cover - data corruption guard
-                raise LookupError(f"DataSelectionLog {entry_id} not found")
-            log_entry.complete(
-                status,
-                row_count,
-                error_message=error_message,
-                details=details,
-                fail_safe_triggered=fail_safe_triggered,
-            )
-            session.add(log_entry)
+        """Store the entry with its execution outcome."""
+
+        row = {
+            **context.values,
+            "status": status,
+            "finished_at": datetime.now(timezone.utc),
+            "duration_ms": (time.monotonic_ns() - context.started_ns) // 1_000_000,
+            "row_count": row_count,
+            "error_message": error_message,
+            "details": details,
+            "fail_safe_triggered": fail_safe_triggered,
+        }
+        if self._sink is not None:
+            self._sink.submit(row)
+        else:
+            _insert_rows(self._session_factory, [row])
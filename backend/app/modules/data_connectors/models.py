@@ -4,17 +4,33 @@ from __future__ import annotations
 import enum
 from datetime import datetime, timezone
 from typing import Any
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from sqlalchemy import Boolean, JSON, DateTime, Enum, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
 
 class DataSelectionStatus(str, enum.Enum):
-    """Lifecycle status of a connector data selection."""
+    """Lifecycle status of a connector data selection.
+
+    The journal only stores finished operations, so ``RUNNING`` is never
+    persisted; it stays valid for the column default and the CHECK constraint.
+    """
 
     RUNNING = "running"
     SUCCESS = "success"
@@ -23,46 +39,59 @@ class DataSelectionStatus(str, enum.Enum):
 
 
 class DataSelectionLog(Base):
-    """Audit log entry for data extractions performed by connectors."""
+    """Audit log entry for data extractions performed by connectors.
+
+    The table is range-partitioned by month on ``started_at``, which is why it
+    is part of the primary key.
+    """
 
     __tablename__ = "data_selection_logs"
+    __table_args__ = (
+        Index("ix_dsl_parameters_gin", "parameters", postgresql_using="gin"),
+        CheckConstraint(
+            "status IN (" + ", ".join(f"'{status.value}'" for status in DataSelectionStatus) + ")",
+            name="ck_dsl_status",
+        ),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
 
-    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
     connector_type: Mapped[str] = mapped_column(String(100), nullable=False)
     operation: Mapped[str] = mapped_column(String(255), nullable=False)
     source: Mapped[str] = mapped_column(String(500), nullable=False)
-    parameters: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    parameters: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     status: Mapped[DataSelectionStatus] = mapped_column(
-        Enum(DataSelectionStatus), nullable=False, default=DataSelectionStatus.RUNNING
+        # Stored as VARCHAR guarded by ck_dsl_status rather than a PostgreSQL enum,
+        # so adding a status is a constraint swap instead of ALTER TYPE.
+        Enum(
+            DataSelectionStatus,
+            native_enum=False,
+            length=32,
+            values_callable=lambda statuses: [status.value for status in statuses],
+        ),
+        nullable=False,
+        default=DataSelectionStatus.RUNNING,
     )
     row_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
-    details: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    details: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     fail_safe_triggered: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     started_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
     )
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
-    def complete(
-        self,
-        status: DataSelectionStatus,
-        row_count: int | None = None,
-        *,
-        error_message: str | None = None,
-        details: dict[str, Any] | None = None,
-        fail_safe_triggered: bool | None = None,
-    ) -> None:
-        """Mark the log entry as finished with computed metadata."""
 
-        finished = datetime.now(timezone.utc)
-        self.status = status
-        self.finished_at = finished
-        self.duration_ms = int((finished - self.started_at).total_seconds() * 1000)
-        self.row_count = row_count
-        self.error_message = error_message
-        if details is not None:
-            self.details = details
-        if fail_safe_triggered is not None:
-            self.fail_safe_triggered = fail_safe_triggered
+# Monthly partitions are created by migrations and the ensure_log_partitions
+# beat task; the default partition catches anything outside them.
+event.listen(
+    DataSelectionLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS data_selection_logs_default PARTITION OF data_selection_logs DEFAULT"),
+)
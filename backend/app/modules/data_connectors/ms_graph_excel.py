@@ -1,9 +1,11 @@
 """Microsoft Graph Excel connector implementation."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable
 
 import httpx
+import orjson
 
 from .base import DataConnector, DataSelectionResult
 from .exceptions import (
@@ -17,6 +19,8 @@ class MicrosoftGraphExcelConnector(DataConnector):
     """Query Excel workbooks exposed through Microsoft Graph."""
 
     operation_name = "excel_table_rows"
+    # Upper bound on page requests in flight for one paged fetch.
+    max_page_concurrency = 8
 
     def __init__(
         self,
@@ -38,6 +42,73 @@ class MicrosoftGraphExcelConnector(DataConnector):
         if self._owns_client:
             self._client.close()
 
+    def _get(self, url: str, token: str, params: dict[str, Any] | None = None) -> httpx.Response:
+        response = self._client.get(
+            url,
+            headers={"Authorization": f"Bearer {token}"},
+            params=params or None,
+        )
+        if response.status_code == 401:
+            raise DataConnectorAuthenticationError("Microsoft Graph rejected the access token")
+        if response.status_code == 403:
+            raise DataConnectorAuthorizationError("Insufficient permissions to access workbook data")
+        response.raise_for_status()
+        return response
+
+    def _get_rows(self, url: str, token: str, params: dict[str, Any]) -> list[Any]:
+        payload = orjson.loads(self._get(url, token, params).content)
+        rows = payload.get("value", []) if isinstance(payload, dict) else []
+        return rows if isinstance(rows, list) else []
+
+    def _count_rows(self, url: str, token: str) -> int | None:
+        try:
+            count = int(self._get(f"{url}/$count", token).text)
+        except (httpx.HTTPStatusError, ValueError):
+            return None
+        return count if count >= 0 else None
+
+    def _get_paged_rows(
+        self, url: str, token: str, params: dict[str, Any], page_size: int
+    ) -> list[Any]:
+        """Fetch all rows in ``$top``/``$skip`` pages.
+
+        With a known row count the pages are requested concurrently and
+        joined in offset order; otherwise they are walked one by one until an
+        empty page comes back. Graph may return fewer rows than ``$top``, so
+        a short page before the end switches to walking from where it
+        stopped instead of leaving a gap.
+        """
+
+        def page(offset: int) -> list[Any]:
+            return self._get_rows(url, token, {**params, "$top": page_size, "$skip": offset})
+
+        def walk(offset: int, rows: list[Any]) -> list[Any]:
+            while batch := page(offset):
+                rows.extend(batch)
+                offset += len(batch)
+            return rows
+
+        # $count ignores $filter, so it cannot size a filtered read.
+        total = None if "$filter" in params else self._count_rows(url, token)
+        if total is None:
+            return walk(0, [])
+
+        offsets = range(0, total, page_size)
+        if len(offsets) <= 1:
+            batches = [page(0)]
+        else:
+            workers = min(self.max_page_concurrency, len(offsets))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="graph-excel") as pool:
+                # map() yields in submission order, so rows keep their offsets.
+                batches = list(pool.map(page, offsets))
+
+        rows: list[Any] = []
+        for offset, batch in zip(offsets or (0,), batches):
+            rows.extend(batch)
+            if len(batch) < min(page_size, total - offset):
+                return walk(offset + len(batch), rows)
+        return rows
+
     def fetch_table_rows(
         self,
         *,
@@ -47,9 +118,14 @@ class MicrosoftGraphExcelConnector(DataConnector):
         select: str | None = None,
         filter_expression: str | None = None,
         top: int | None = None,
+        page_size: int | None = None,
         fail_safe_rows: list[list[Any]] | None = None,
     ) -> DataSelectionResult:
-        """Retrieve rows from an Excel table via Microsoft Graph."""
+        """Retrieve rows from an Excel table via Microsoft Graph.
+
+        ``page_size`` splits the read into ``$top``/``$skip`` pages fetched
+        concurrently; it is ignored when ``top`` limits the result already.
+        """
 
         if not drive_item_id:
             raise DataConnectorConfigurationError("drive_item_id is required")
@@ -57,6 +133,8 @@ class MicrosoftGraphExcelConnector(DataConnector):
             raise DataConnectorConfigurationError("worksheet is required")
         if not table:
             raise DataConnectorConfigurationError("table is required")
+        if page_size is not None and page_size <= 0:
+            raise DataConnectorConfigurationError("page_size must be positive")
 
         def _operation() -> DataSelectionResult:
             token = self._token_provider()
@@ -75,25 +153,17 @@ class MicrosoftGraphExcelConnector(DataConnector):
             if top is not None:
                 params["$top"] = top
 
-            response = self._client.get(
-                url,
-                headers={"Authorization": f"Bearer {token}"},
-                params=params or None,
-            )
-
-            if response.status_code == 401:
-                raise DataConnectorAuthenticationError("Microsoft Graph rejected the access token")
-            if response.status_code == 403:
-                raise DataConnectorAuthorizationError("Insufficient permissions to access workbook data")
-            response.raise_for_status()
-
-            payload = response.json()
-            rows = payload.get("value", []) if isinstance(payload, dict) else []
-            extracted_rows: list[list[Any]] = []
-            for row in rows:
-                values = row.get("values") if isinstance(row, dict) else None
-                if isinstance(values, list):
-                    extracted_rows.extend([v for v in values if isinstance(v, list)])
+            if page_size is not None and top is None:
+                rows = self._get_paged_rows(url, token, params, page_size)
+            else:
+                rows = self._get_rows(url, token, params)
+            extracted_rows: list[list[Any]] = [
+                value
+                for row in rows
+                if isinstance(row, dict) and isinstance(values := row.get("values"), list)
+                for value in values
+                if isinstance(value, list)
+            ]
             metadata = {
                 "drive_item_id": drive_item_id,
                 "worksheet": worksheet,
@@ -122,6 +192,7 @@ class MicrosoftGraphExcelConnector(DataConnector):
                 "select": select,
                 "filter": filter_expression,
                 "top": top,
+                "page_size": page_size,
             },
             operation=_operation,
             fallback=fallback,
@@ -1,6 +1,7 @@
 """PostgreSQL read-only connector implementation."""
 from __future__ import annotations
 
+import re
 from typing import Any
 
 from sqlalchemy import create_engine, text
@@ -14,11 +15,17 @@ from .exceptions import (
     DataConnectorReadOnlyViolation,
 )
 
+# Anchored on the first keyword, so long statements are never copied or
+# lowercased. The READ ONLY transaction remains the actual guard.
+_READ_ONLY_STATEMENT = re.compile(r"\s*(?:select|with)\b", re.IGNORECASE)
+
 
 class PostgresReadOnlyConnector(DataConnector):
     """Execute read-only SQL statements against PostgreSQL."""
 
     operation_name = "sql_select"
+    # Rows pulled per round trip from the server-side cursor.
+    fetch_size = 1000
 
     def __init__(
         self,
@@ -38,8 +45,7 @@ class PostgresReadOnlyConnector(DataConnector):
             self._engine.dispose()
 
     def _ensure_read_only(self, sql: str) -> None:
-        statement = sql.lstrip().lower()
-        if not (statement.startswith("select") or statement.startswith("with")):
+        if _READ_ONLY_STATEMENT.match(sql) is None:
             raise DataConnectorReadOnlyViolation("Only SELECT/CTE statements are allowed")
 
     def execute_query(
@@ -59,8 +65,17 @@ class PostgresReadOnlyConnector(DataConnector):
                 with self._engine.connect() as connection:
                     with connection.begin():
                         connection.execute(text("SET TRANSACTION READ ONLY"))
-                        result = connection.execute(text(sql), parameters or {})
-                        rows = [dict(row._mapping) for row in result]
+                        # Server-side cursor: the driver never buffers the full
+                        # result next to the Python rows built from it.
+                        result = connection.execution_options(
+                            stream_results=True, yield_per=self.fetch_size
+                        ).execute(text(sql), parameters or {})
+                        keys = tuple(result.keys())
+                        rows = [
+                            dict(zip(keys, row))
+                            for partition in result.partitions()
+                            for row in partition
+                        ]
             except SQLAlchemyError as exc:  # pragma: no cover - depends on DB
                 raise DataConnectorOperationalError(str(exc)) from exc
 
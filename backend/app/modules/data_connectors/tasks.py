@@ -1,7 +1,22 @@
 """Celery tasks for the Data Connectors module."""
 from __future__ import annotations
 
+from typing import Any
+
 from celery import shared_task
+from celery.signals import worker_process_shutdown
+from sqlalchemy import text
+
+from app.core.database import db
+
+from .journal import close_journal_sink
+
+
+@worker_process_shutdown.connect
+def _flush_journal(**_: Any) -> None:
+    # Prefork children exit via os._exit, so the sink's atexit hook never runs;
+    # without this, rows queued when a child is recycled would be dropped.
+    close_journal_sink()
 
 
 @shared_task
@@ -10,3 +25,13 @@ def example_task(payload: dict[str, str]) -> dict[str, str]:
 
     return {"module": "data_connectors", **payload}
 
+
+@shared_task(ignore_result=True)
+def ensure_log_partitions() -> None:
+    """Create the current and next monthly ``data_selection_logs`` partitions."""
+
+    with db.session() as session:
+        session.execute(text("SELECT data_selection_logs_ensure_partition(now()::date)"))
+        session.execute(
+            text("SELECT data_selection_logs_ensure_partition((now() + interval '1 month')::date)")
+        )
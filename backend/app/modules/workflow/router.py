@@ -1,20 +1,93 @@
 """API router for the Workflow domain."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+import hashlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 
 from ...schemas.health import HealthStatus
 from .schemas import (
     WorkflowActionRequest,
     WorkflowCreateRequest,
+    WorkflowHistoryEntryModel,
+    WorkflowHistoryPage,
     WorkflowInstanceModel,
     WorkflowListResponse,
 )
-from .service import workflow_engine
+from .service import WorkflowInstance, WorkflowSnapshot, workflow_engine
 
 router = APIRouter()
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Return whether ``If-None-Match`` already names ``etag``."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+@dataclass(frozen=True, slots=True)
+class _VersionedInstance:
+    """An instance paired with the snapshot its response is built from.
+
+    Equality and hashing use only ``(id, version)``, so it keys the body cache
+    while the body itself comes from ``snapshot``, never from the live instance.
+    """
+
+    id: str
+    version: int
+    instance: WorkflowInstance = field(compare=False)
+    snapshot: WorkflowSnapshot = field(compare=False)
+
+    @classmethod
+    def of(cls, instance: WorkflowInstance) -> "_VersionedInstance":
+        snapshot = instance.snapshot()
+        return cls(instance.id, snapshot.version, instance, snapshot)
+
+    @property
+    def etag(self) -> str:
+        return f'W/"{self.id}:{self.version}"'
+
+
+def _collection_etag(entries: List[_VersionedInstance]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for workflow_id, version in sorted((entry.id, entry.version) for entry in entries):
+        digest.update(f"{workflow_id}:{version};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+@lru_cache(maxsize=1024)
+def _serialize_instance(entry: _VersionedInstance) -> bytes:
+    """JSON body of a workflow instance at ``entry.version``.
+
+    ``add_history`` bumps the version after every change, so superseded entries
+    are never looked up again and simply age out of the LRU.
+    """
+
+    model = WorkflowInstanceModel.from_domain(entry.instance, entry.snapshot)
+    return model.model_dump_json().encode()
+
+
+def _instance_response(entry: _VersionedInstance, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serve the cached JSON body of ``entry`` with its ETag.
+
+    Returning a ``Response`` skips FastAPI's response_model round trip;
+    ``response_model`` stays on the routes for OpenAPI.
+    """
+
+    return Response(
+        content=_serialize_instance(entry),
+        status_code=status_code,
+        media_type="application/json",
+        headers={"ETag": entry.etag},
+    )
+
+
 @router.get("/health", response_model=HealthStatus, status_code=status.HTTP_200_OK)
 def healthcheck() -> HealthStatus:
     """Return a simple status payload for liveness probes."""
@@ -23,7 +96,7 @@ def healthcheck() -> HealthStatus:
 
 
 @router.post("/instances", response_model=WorkflowInstanceModel, status_code=status.HTTP_201_CREATED)
-def create_workflow(payload: WorkflowCreateRequest) -> WorkflowInstanceModel:
+def create_workflow(payload: WorkflowCreateRequest) -> Response:
     """Create a new workflow instance for an objective."""
 
     instance = workflow_engine.create_instance(
@@ -32,29 +105,62 @@ def create_workflow(payload: WorkflowCreateRequest) -> WorkflowInstanceModel:
         tenant_id=payload.tenant_id,
         workspace_ids=payload.workspace_ids,
     )
-    return WorkflowInstanceModel.from_domain(instance)
+    return _instance_response(_VersionedInstance.of(instance), status.HTTP_201_CREATED)
 
 
 @router.get("/instances", response_model=WorkflowListResponse)
-def list_workflows() -> WorkflowListResponse:
+def list_workflows(request: Request) -> Response:
     """List workflow instances currently tracked by the engine."""
 
-    items = [WorkflowInstanceModel.from_domain(instance) for instance in workflow_engine.list_instances()]
-    return WorkflowListResponse(items=items)
+    entries = [_VersionedInstance.of(instance) for instance in workflow_engine.list_instances()]
+    etag = _collection_etag(entries)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    items = b",".join(_serialize_instance(entry) for entry in entries)
+    return Response(
+        content=b'{"items":[' + items + b"]}",
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
 
 
 @router.get("/instances/{workflow_id}", response_model=WorkflowInstanceModel)
-def get_workflow(workflow_id: str) -> WorkflowInstanceModel:
+def get_workflow(workflow_id: str, request: Request) -> Response:
     """Fetch a specific workflow instance."""
 
     instance = workflow_engine.get_instance(workflow_id)
     if not instance:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow not found")
-    return WorkflowInstanceModel.from_domain(instance)
+    entry = _VersionedInstance.of(instance)
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry.etag})
+    return _instance_response(entry)
+
+
+@router.get("/instances/{workflow_id}/history", response_model=WorkflowHistoryPage)
+def get_workflow_history(
+    workflow_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+) -> Response:
+    """Page through the retained history of a workflow instance, oldest first."""
+
+    instance = workflow_engine.get_instance(workflow_id)
+    if not instance:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow not found")
+    history = instance.snapshot().history
+    items = [
+        WorkflowHistoryEntryModel.from_domain(entry) for entry in history[offset : offset + limit]
+    ]
+    end = offset + len(items)
+    page = WorkflowHistoryPage.model_construct(
+        items=items, next_offset=end if end < len(history) else None
+    )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @router.post("/instances/{workflow_id}/actions", response_model=WorkflowInstanceModel)
-def transition_workflow(workflow_id: str, payload: WorkflowActionRequest) -> WorkflowInstanceModel:
+def transition_workflow(workflow_id: str, payload: WorkflowActionRequest) -> Response:
     """Execute a workflow transition after validating access policies."""
 
     context = payload.context.to_domain()
@@ -73,4 +179,4 @@ def transition_workflow(workflow_id: str, payload: WorkflowActionRequest) -> Wor
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    return WorkflowInstanceModel.from_domain(instance)
+    return _instance_response(_VersionedInstance.of(instance))
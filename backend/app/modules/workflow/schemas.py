@@ -2,13 +2,17 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List
+from typing import List, Literal
 
 from pydantic import BaseModel, Field
 
 from ...services.access_policies import ObjectRole
 from ..auth.schemas import AccessContextModel
-from .service import WorkflowHistoryEntry, WorkflowInstance, WorkflowState
+from .service import WorkflowHistoryEntry, WorkflowInstance, WorkflowSnapshot
+
+# Literal of the WorkflowState values: validating a literal string is cheaper
+# than an enum lookup, and from_domain hands over ``.value`` directly.
+WorkflowStateValue = Literal["draft", "expert_review", "manager_approval", "active", "returned"]
 
 
 class WorkflowCreateRequest(BaseModel):
@@ -29,16 +33,17 @@ class WorkflowHistoryEntryModel(BaseModel):
     timestamp: datetime
     action: str
     actor_id: str
-    resulting_state: WorkflowState
+    resulting_state: WorkflowStateValue
     comment: str | None = None
 
     @classmethod
     def from_domain(cls, entry: WorkflowHistoryEntry) -> "WorkflowHistoryEntryModel":
-        return cls(
+        # Domain objects are already typed; skip validation.
+        return cls.model_construct(
             timestamp=entry.timestamp,
             action=entry.action,
             actor_id=entry.actor_id,
-            resulting_state=entry.resulting_state,
+            resulting_state=entry.resulting_state.value,
             comment=entry.comment,
         )
 
@@ -49,21 +54,46 @@ class WorkflowInstanceModel(BaseModel):
     owner_id: str
     tenant_id: str
     workspace_ids: List[str]
-    state: WorkflowState
+    state: WorkflowStateValue
     history: List[WorkflowHistoryEntryModel]
 
     @classmethod
-    def from_domain(cls, instance: WorkflowInstance) -> "WorkflowInstanceModel":
-        return cls(
+    def from_domain(
+        cls, instance: WorkflowInstance, snapshot: WorkflowSnapshot | None = None
+    ) -> "WorkflowInstanceModel":
+        # Domain objects are already typed; skip validation. History entries
+        # are constructed inline rather than through one from_domain call each.
+        # Mutable parts come from one snapshot so they cannot change mid-build.
+        if snapshot is None:
+            snapshot = instance.snapshot()
+        construct = WorkflowHistoryEntryModel.model_construct
+        history = [
+            construct(
+                timestamp=entry.timestamp,
+                action=entry.action,
+                actor_id=entry.actor_id,
+                resulting_state=entry.resulting_state.value,
+                comment=entry.comment,
+            )
+            for entry in snapshot.history
+        ]
+        return cls.model_construct(
             id=instance.id,
             objective_id=instance.objective_id,
             owner_id=instance.owner_id,
             tenant_id=instance.tenant_id,
-            workspace_ids=list(instance.workspace_ids),
-            state=instance.state,
-            history=[WorkflowHistoryEntryModel.from_domain(entry) for entry in instance.history],
+            workspace_ids=list(instance.workspace_ids_view),
+            state=snapshot.state.value,
+            history=history,
         )
 
 
 class WorkflowListResponse(BaseModel):
     items: List[WorkflowInstanceModel]
+
+
+class WorkflowHistoryPage(BaseModel):
+    items: List[WorkflowHistoryEntryModel]
+    next_offset: int | None = Field(
+        None, description="Offset of the next page, or null when the retained history is exhausted"
+    )
@@ -1,15 +1,23 @@
 """Workflow engine handling OKR approval lifecycle."""
 from __future__ import annotations
 
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Sequence
+from types import MappingProxyType
+from typing import Deque, Dict, List, Mapping, Sequence, Tuple
 from uuid import uuid4
 
+from ...core.config import get_settings
 from ...services.access_policies import AccessContext, AccessDecision, ObjectRole, policy_engine
 
+_UTC = timezone.utc
 
+
+# Kept as a str Enum: the values are the API contract, and members hash with
+# str's C-level hash, so the flat transition table below needs no IntEnum.
 class WorkflowState(str, Enum):
     DRAFT = "draft"
     REVIEW = "expert_review"
@@ -18,7 +26,7 @@ class WorkflowState(str, Enum):
     RETURNED = "returned"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WorkflowHistoryEntry:
     timestamp: datetime
     action: str
@@ -27,27 +35,83 @@ class WorkflowHistoryEntry:
     comment: str | None = None
 
 
-@dataclass
+def _new_history() -> Deque[WorkflowHistoryEntry]:
+    """Ring buffer keeping only the most recent ``WORKFLOW_HISTORY_LIMIT`` entries."""
+
+    return deque(maxlen=get_settings().workflow_history_limit)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowSnapshot:
+    """Consistent view of an instance taken under its lock."""
+
+    state: WorkflowState
+    version: int
+    history: Tuple[WorkflowHistoryEntry, ...]
+
+
+@dataclass(slots=True)
 class WorkflowInstance:
     id: str
     objective_id: str
     owner_id: str
     tenant_id: str
-    workspace_ids: Sequence[str]
+    workspace_ids: frozenset[str]
     state: WorkflowState = WorkflowState.DRAFT
-    history: List[WorkflowHistoryEntry] = field(default_factory=list)
-
-    def add_history(self, action: str, actor_id: str, state: WorkflowState, comment: str | None) -> None:
-        self.history.append(
-            WorkflowHistoryEntry(
-                timestamp=datetime.now(timezone.utc),
-                action=action,
-                actor_id=actor_id,
-                resulting_state=state,
-                comment=comment,
-            )
+    history: Deque[WorkflowHistoryEntry] = field(default_factory=_new_history)
+    # Bumped on every recorded transition; backs the ETag of API responses.
+    version: int = 0
+    # Sorted view of ``workspace_ids`` for serialisation; the set never changes.
+    workspace_ids_view: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    # Policy resource attributes; built once since they never change.
+    resource_attributes: Mapping[str, frozenset[str] | str] = field(
+        init=False, repr=False, compare=False
+    )
+    # Guards state, history and version. Routes run in the threadpool, and a
+    # deque raises if it is appended to while another thread iterates it.
+    lock: threading.RLock = field(
+        default_factory=threading.RLock, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.workspace_ids, frozenset):
+            self.workspace_ids = frozenset(self.workspace_ids)
+        self.workspace_ids_view = tuple(sorted(self.workspace_ids))
+        self.resource_attributes = MappingProxyType(
+            {
+                "id": self.objective_id,
+                "workspace_ids": self.workspace_ids,
+                "owner_id": self.owner_id,
+            }
         )
 
+    def add_history(
+        self,
+        action: str,
+        actor_id: str,
+        state: WorkflowState,
+        comment: str | None,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """Record a transition; replays pass the original ``timestamp``."""
+
+        entry = WorkflowHistoryEntry(
+            timestamp=timestamp or datetime.now(_UTC),
+            action=action,
+            actor_id=actor_id,
+            resulting_state=state,
+            comment=comment,
+        )
+        with self.lock:
+            self.history.append(entry)
+            self.version += 1
+
+    def snapshot(self) -> WorkflowSnapshot:
+        """Copy state, version and history together; readers iterate the copy."""
+
+        with self.lock:
+            return WorkflowSnapshot(self.state, self.version, tuple(self.history))
+
 
 class WorkflowEngine:
     """In-memory workflow state machine coordinating approvals."""
@@ -88,7 +152,7 @@ class WorkflowEngine:
             objective_id=objective_id,
             owner_id=owner_id,
             tenant_id=tenant_id,
-            workspace_ids=list(workspace_ids),
+            workspace_ids=frozenset(workspace_ids),
         )
         instance.add_history("workflow:create", owner_id, WorkflowState.DRAFT, "Workflow created")
         self._instances[workflow_id] = instance
@@ -112,16 +176,11 @@ class WorkflowEngine:
         if not instance:
             raise KeyError("Workflow not found")
 
-        resource_attributes = {
-            "id": instance.objective_id,
-            "workspace_ids": list(instance.workspace_ids),
-            "owner_id": instance.owner_id,
-        }
         decision, permissions = policy_engine.is_action_allowed(
             user_id=actor_context.user_id,
             action=action,
             context=actor_context,
-            resource_attributes=resource_attributes,
+            resource_attributes=instance.resource_attributes,
             object_roles=object_roles,
         )
         if decision is not AccessDecision.ALLOW:
@@ -129,16 +188,22 @@ class WorkflowEngine:
                 f"Action '{action}' not permitted for user {actor_context.user_id}. Permissions: {permissions}"
             )
 
-        try:
-            next_state = self.transitions[instance.state][action]
-        except KeyError as exc:
-            raise ValueError(
-                f"Action '{action}' is not valid from state '{instance.state}'"
-            ) from exc
+        with instance.lock:
+            next_state = _TRANSITIONS.get((instance.state, action))
+            if next_state is None:
+                raise ValueError(f"Action '{action}' is not valid from state '{instance.state}'")
 
-        instance.state = next_state
-        instance.add_history(action, actor_context.user_id, next_state, comment)
+            instance.state = next_state
+            instance.add_history(action, actor_context.user_id, next_state, comment)
         return instance
 
 
+# Flattened ``(state, action) -> next state`` view of ``WorkflowEngine.transitions``
+# so a transition is a single hashed probe.
+_TRANSITIONS: Dict[Tuple[WorkflowState, str], WorkflowState] = {
+    (state, action): next_state
+    for state, actions in WorkflowEngine.transitions.items()
+    for action, next_state in actions.items()
+}
+
 workflow_engine = WorkflowEngine()
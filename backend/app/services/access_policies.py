@@ -15,9 +15,23 @@ FastAPI dependencies, background tasks, or even external workers.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import threading
+from dataclasses import dataclass, field, fields
 from enum import Enum
-from typing import Dict, Iterable, Mapping, MutableMapping, Sequence, Set
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    Set,
+    get_type_hints,
+)
 
 
 class ObjectRole(str, Enum):
@@ -35,6 +49,9 @@ class AccessDecision(str, Enum):
     DENY = "deny"
 
 
+ConditionEvaluator = Callable[["AccessContext", Mapping[str, Sequence[str] | str]], bool]
+
+
 class ConditionOperator(str, Enum):
     """Supported operators for attribute conditions."""
 
@@ -44,7 +61,7 @@ class ConditionOperator(str, Enum):
     EQUALS = "equals"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AccessContext:
     """Runtime attributes about the caller used for ABAC evaluation."""
 
@@ -56,9 +73,41 @@ class AccessContext:
     ad_groups: frozenset[str] = field(default_factory=frozenset)
     level: str | None = None
     attributes: Mapping[str, Sequence[str] | str] = field(default_factory=dict)
+    # Hashable fingerprint of every field, taken once at construction.
+    cache_key: Hashable = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Compiled conditions call set methods on these fields directly, so
+        # sets or lists from direct callers are coerced once here.
+        for name in _FROZENSET_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, frozenset):
+                object.__setattr__(self, name, frozenset(_as_iterable(value)))
+        # Copied into a read-only mapping of frozen values: a caller mutating
+        # its own dict later must not leave ``cache_key`` describing stale data.
+        object.__setattr__(
+            self,
+            "attributes",
+            MappingProxyType(
+                {key: _freeze_value(value) for key, value in self.attributes.items()}
+            ),
+        )
+        object.__setattr__(self, "cache_key", self._fingerprint())
+
+    def _fingerprint(self) -> Hashable:
+        return (
+            self.user_id,
+            self.tenant_id,
+            self.workspace_ids,
+            self.manager_of,
+            self.labels,
+            self.ad_groups,
+            self.level,
+            frozenset(self.attributes.items()),
+        )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AttributeCondition:
     """Declarative ABAC rule bound to a role definition."""
 
@@ -66,6 +115,11 @@ class AttributeCondition:
     operator: ConditionOperator
     values: frozenset[str] = field(default_factory=frozenset)
     resource_attribute: str | None = None
+    # Specialised evaluator with the operator and attribute lookup resolved.
+    compiled: ConditionEvaluator = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "compiled", self._compile())
 
     def evaluate(
         self,
@@ -74,28 +128,60 @@ class AttributeCondition:
     ) -> bool:
         """Return ``True`` if the context satisfies the condition."""
 
-        resource_attributes = resource_attributes or {}
-        context_value = _coerce_to_set(_get_context_attribute(context, self.attribute))
+        return self.compiled(context, resource_attributes or {})
+
+    def _compile(self) -> ConditionEvaluator:
+        get_value = _context_getter(self.attribute)
+        expected = self.values
 
         if self.operator is ConditionOperator.ANY:
-            return bool(context_value)
+            return lambda context, _: _has_value(get_value(context))
+
+        if self.attribute in _FROZENSET_FIELDS:
+            return self._compile_for_frozenset(get_value)
+
+        if self.operator is ConditionOperator.EQUALS:
+            return lambda context, _: _has_value(value := get_value(context)) and (
+                _as_set(value) == expected
+            )
+
+        if self.operator is ConditionOperator.CONTAINS:
+            return lambda context, _: not expected.isdisjoint(_as_iterable(get_value(context)))
+
+        if self.operator is ConditionOperator.MATCH_RESOURCE and self.resource_attribute:
+            resource_attribute = self.resource_attribute
+            return lambda context, resource: _has_value(value := get_value(context)) and (
+                not _as_set(value).isdisjoint(_as_iterable(resource.get(resource_attribute)))
+            )
+
+        return lambda context, resource: False
+
+    def _compile_for_frozenset(
+        self, get_value: Callable[[AccessContext], frozenset[str]]
+    ) -> ConditionEvaluator:
+        # Typed AccessContext fields are always frozensets, so the coercion
+        # helpers can be skipped and an empty set (the common case for labels
+        # and manager_of) fails before any set operation.
+        expected = self.values
 
         if self.operator is ConditionOperator.EQUALS:
-            return bool(context_value) and context_value == self.values
+            return lambda context, _: bool(value := get_value(context)) and value == expected
 
         if self.operator is ConditionOperator.CONTAINS:
-            return bool(context_value.intersection(self.values))
+            return lambda context, _: bool(value := get_value(context)) and not (
+                expected.isdisjoint(value)
+            )
 
-        if self.operator is ConditionOperator.MATCH_RESOURCE:
-            if not self.resource_attribute:
-                return False
-            resource_value = _coerce_to_set(resource_attributes.get(self.resource_attribute, set()))
-            return bool(context_value.intersection(resource_value))
+        if self.operator is ConditionOperator.MATCH_RESOURCE and self.resource_attribute:
+            resource_attribute = self.resource_attribute
+            return lambda context, resource: bool(value := get_value(context)) and not (
+                value.isdisjoint(_as_iterable(resource.get(resource_attribute)))
+            )
 
-        return False
+        return lambda context, resource: False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RoleDefinition:
     """RBAC role with optional ABAC conditions and implied roles."""
 
@@ -103,26 +189,79 @@ class RoleDefinition:
     permissions: frozenset[str]
     conditions: tuple[AttributeCondition, ...] = ()
     implied_roles: frozenset[str] = field(default_factory=frozenset)
+    compiled_conditions: tuple[ConditionEvaluator, ...] = field(
+        init=False, repr=False, compare=False
+    )
+    permission_mask: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self, "compiled_conditions", tuple(condition.compiled for condition in self.conditions)
+        )
+        object.__setattr__(self, "permission_mask", _permission_mask(self.permissions))
 
 
 class AccessPolicyEngine:
-    """Runtime engine used to manage RBAC/ABAC/object-role state."""
+    """Runtime engine used to manage RBAC/ABAC/object-role state.
+
+    Permissions are combined as integer bitmasks (see :func:`_permission_mask`)
+    and only turned back into names for the returned permission set.
+    Role-derived masks are memoised per (user, context, resource) and the
+    memo is dropped whenever roles or assignments change. Only the resource
+    attributes that some role condition reads are part of the memo key, so
+    per-object values such as ``id`` do not defeat it.
+    """
+
+    permission_cache_size = 4096
 
     def __init__(self) -> None:
+        self._permission_cache: Dict[Hashable, int] = {}
         self._roles: Dict[str, RoleDefinition] = {}
+        # Resource attributes read by any registered role condition.
+        self._resource_keys: tuple[str, ...] = ()
         self._role_assignments: MutableMapping[str, Set[str]] = {}
-        self._object_roles: MutableMapping[tuple[str, str], Set[ObjectRole]] = {}
+        # object_id -> user_id -> roles, so a lookup needs no key tuple. Role
+        # sets are frozen and replaced on write so they key the mask memo as is.
+        self._object_roles: Dict[str, Dict[str, frozenset[ObjectRole]]] = {}
         self._object_role_permissions: MutableMapping[ObjectRole, Set[str]] = {
             ObjectRole.VIEWER: {"workflow:view", "okr:view"},
             ObjectRole.EDITOR: {"workflow:view", "workflow:edit", "okr:edit"},
             ObjectRole.APPROVER: {"workflow:view", "workflow:approve"},
         }
+        self._object_role_masks: Dict[ObjectRole, int] = {
+            role: _permission_mask(permissions)
+            for role, permissions in self._object_role_permissions.items()
+        }
+        # Combined mask per distinct role set; keys are subsets of ObjectRole,
+        # so this stays tiny.
+        self._object_role_set_masks: Dict[frozenset[ObjectRole], int] = {}
 
     # -- Role registration -------------------------------------------------
     def register_role(self, role: RoleDefinition) -> None:
         """Register or overwrite a role definition."""
 
         self._roles[role.name] = role
+        self._roles_changed()
+
+    def register_roles(self, roles: Iterable[RoleDefinition]) -> None:
+        """Register or overwrite several role definitions at once."""
+
+        self._roles.update({role.name: role for role in roles})
+        self._roles_changed()
+
+    def _roles_changed(self) -> None:
+        self._resource_keys = tuple(
+            sorted(
+                {
+                    condition.resource_attribute
+                    for role in self._roles.values()
+                    for condition in role.conditions
+                    if condition.operator is ConditionOperator.MATCH_RESOURCE
+                    and condition.resource_attribute
+                }
+            )
+        )
+        self._permission_cache.clear()
 
     def describe_roles(self) -> list[RoleDefinition]:
         """Return all registered role definitions."""
@@ -136,6 +275,7 @@ class AccessPolicyEngine:
         if role_name not in self._roles:
             raise KeyError(f"Unknown role '{role_name}'")
         self._role_assignments.setdefault(user_id, set()).add(role_name)
+        self._permission_cache.clear()
 
     def revoke_role(self, user_id: str, role_name: str) -> None:
         """Remove a role from a user."""
@@ -144,6 +284,7 @@ class AccessPolicyEngine:
             self._role_assignments[user_id].discard(role_name)
             if not self._role_assignments[user_id]:
                 del self._role_assignments[user_id]
+            self._permission_cache.clear()
 
     def get_assignments(self, user_id: str) -> set[str]:
         """Return a copy of assigned role names."""
@@ -154,16 +295,22 @@ class AccessPolicyEngine:
     def grant_object_role(self, user_id: str, object_id: str, role: ObjectRole) -> None:
         """Grant an object-level role to a user for a resource."""
 
-        self._object_roles.setdefault((object_id, user_id), set()).add(role)
+        grants = self._object_roles.setdefault(object_id, {})
+        grants[user_id] = grants.get(user_id, frozenset()) | {role}
 
     def revoke_object_role(self, user_id: str, object_id: str, role: ObjectRole) -> None:
         """Revoke an object-level role assignment."""
 
-        key = (object_id, user_id)
-        if key in self._object_roles:
-            self._object_roles[key].discard(role)
-            if not self._object_roles[key]:
-                del self._object_roles[key]
+        grants = self._object_roles.get(object_id)
+        if grants is None or user_id not in grants:
+            return
+        remaining = grants[user_id] - {role}
+        if remaining:
+            grants[user_id] = remaining
+        else:
+            del grants[user_id]
+            if not grants:
+                del self._object_roles[object_id]
 
     def configure_object_role_permissions(
         self, role: ObjectRole, permissions: Iterable[str]
@@ -171,14 +318,18 @@ class AccessPolicyEngine:
         """Override permissions granted by an object-level role."""
 
         self._object_role_permissions[role] = set(permissions)
-
-    def _permissions_from_object_roles(
-        self, object_roles: Iterable[ObjectRole]
-    ) -> set[str]:
-        permissions: set[str] = set()
-        for role in object_roles:
-            permissions.update(self._object_role_permissions.get(role, set()))
-        return permissions
+        self._object_role_masks[role] = _permission_mask(self._object_role_permissions[role])
+        self._object_role_set_masks.clear()
+
+    def _permissions_from_object_roles(self, object_roles: Iterable[ObjectRole]) -> int:
+        roles = object_roles if isinstance(object_roles, frozenset) else frozenset(object_roles)
+        mask = self._object_role_set_masks.get(roles)
+        if mask is None:
+            mask = 0
+            for role in roles:
+                mask |= self._object_role_masks.get(role, 0)
+            self._object_role_set_masks[roles] = mask
+        return mask
 
     # -- Evaluation --------------------------------------------------------
     def is_action_allowed(
@@ -188,44 +339,63 @@ class AccessPolicyEngine:
         context: AccessContext,
         resource_attributes: Mapping[str, Sequence[str] | str] | None = None,
         object_roles: Iterable[ObjectRole] | None = None,
-    ) -> tuple[AccessDecision, set[str]]:
+    ) -> tuple[AccessDecision, frozenset[str]]:
         """Evaluate the supplied action and return the decision + permissions."""
 
         resource_attributes = resource_attributes or {}
-        effective_permissions = self._collect_permissions(
+        mask = self._collect_permissions(
             user_id=user_id, context=context, resource_attributes=resource_attributes
         )
 
-        combined_permissions = set(effective_permissions)
-
         if object_roles is None:
-            object_roles = self._object_roles.get((resource_attributes.get("id", ""), user_id), set())
+            grants = self._object_roles.get(resource_attributes.get("id", ""), _NO_GRANTS)
+            object_roles = grants.get(user_id, ())
 
         if object_roles:
-            combined_permissions.update(self._permissions_from_object_roles(object_roles))
+            mask |= self._permissions_from_object_roles(object_roles)
 
-        if action in combined_permissions:
-            return AccessDecision.ALLOW, combined_permissions
-        return AccessDecision.DENY, combined_permissions
+        if mask & _PERMISSION_BITS.get(action, 0):
+            return AccessDecision.ALLOW, _permission_names(mask)
+        return AccessDecision.DENY, _permission_names(mask)
 
     def _collect_permissions(
         self,
         user_id: str,
         context: AccessContext,
         resource_attributes: Mapping[str, Sequence[str] | str],
-    ) -> set[str]:
-        permissions: set[str] = set()
-        visited: set[str] = set()
-        for role_name in self._role_assignments.get(user_id, set()):
-            permissions.update(
-                self._resolve_permissions(
+    ) -> int:
+        key = (
+            user_id,
+            context.cache_key,
+            tuple(_freeze_value(resource_attributes.get(name)) for name in self._resource_keys),
+        )
+        mask = self._permission_cache.get(key)
+        if mask is None:
+            mask = self._collect_role_permissions(user_id, context, resource_attributes)
+            if len(self._permission_cache) >= self.permission_cache_size:
+                self._permission_cache.clear()
+            self._permission_cache[key] = mask
+        return mask
+
+    def _collect_role_permissions(
+        self,
+        user_id: str,
+        context: AccessContext,
+        resource_attributes: Mapping[str, Sequence[str] | str],
+    ) -> int:
+        mask = 0
+        visited = _visited_sets.borrow()
+        try:
+            for role_name in self._role_assignments.get(user_id, set()):
+                mask |= self._resolve_permissions(
                     role_name=role_name,
                     visited=visited,
                     context=context,
                     resource_attributes=resource_attributes,
                 )
-            )
-        return permissions
+        finally:
+            _visited_sets.give_back(visited)
+        return mask
 
     def _resolve_permissions(
         self,
@@ -233,43 +403,111 @@ class AccessPolicyEngine:
         visited: set[str],
         context: AccessContext,
         resource_attributes: Mapping[str, Sequence[str] | str],
-    ) -> set[str]:
+    ) -> int:
         if role_name in visited:
-            return set()
+            return 0
 
         visited.add(role_name)
         role = self._roles.get(role_name)
         if role is None:
-            return set()
+            return 0
 
-        if not all(condition.evaluate(context, resource_attributes) for condition in role.conditions):
-            return set()
+        if not all(check(context, resource_attributes) for check in role.compiled_conditions):
+            return 0
 
-        permissions = set(role.permissions)
+        mask = role.permission_mask
         for implied in role.implied_roles:
-            permissions.update(
-                self._resolve_permissions(
-                    role_name=implied,
-                    visited=visited,
-                    context=context,
-                    resource_attributes=resource_attributes,
-                )
+            mask |= self._resolve_permissions(
+                role_name=implied,
+                visited=visited,
+                context=context,
+                resource_attributes=resource_attributes,
             )
-        return permissions
+        return mask
+
+
+_NO_GRANTS: Mapping[str, frozenset[ObjectRole]] = MappingProxyType({})
+
+# Permission names are interned to single bits the first time a role or object
+# role mentions them; bits are never reassigned, so masks stay valid.
+_PERMISSION_BITS: Dict[str, int] = {}
+_PERMISSION_BITS_LOCK = threading.Lock()
+
+
+def _permission_mask(permissions: Iterable[str]) -> int:
+    mask = 0
+    for permission in permissions:
+        bit = _PERMISSION_BITS.get(permission)
+        if bit is None:
+            with _PERMISSION_BITS_LOCK:
+                bit = _PERMISSION_BITS.setdefault(permission, 1 << len(_PERMISSION_BITS))
+        mask |= bit
+    return mask
+
+
+@lru_cache(maxsize=1024)
+def _permission_names(mask: int) -> frozenset[str]:
+    return frozenset(name for name, bit in list(_PERMISSION_BITS.items()) if mask & bit)
+
+
+class _SetPool(threading.local):
+    """Per-thread free list of scratch sets; a set never escapes its borrower."""
+
+    def __init__(self) -> None:
+        self.free: list[set[str]] = []
+
+    def borrow(self) -> set[str]:
+        return self.free.pop() if self.free else set()
+
+    def give_back(self, scratch: set[str]) -> None:
+        scratch.clear()
+        self.free.append(scratch)
+
+
+_visited_sets = _SetPool()
+
+_CONTEXT_FIELDS = frozenset(f.name for f in fields(AccessContext) if f.init)
+_FROZENSET_FIELDS = frozenset(
+    name for name, hint in get_type_hints(AccessContext).items() if hint == frozenset[str]
+)
+
+
+def _context_getter(attribute: str) -> Callable[[AccessContext], Sequence[str] | str | None]:
+    if attribute in _CONTEXT_FIELDS:
+        return attrgetter(attribute)
+
+    def get_extra(context: AccessContext) -> Sequence[str] | str | None:
+        extra = context.attributes
+        return extra.get(attribute) if isinstance(extra, Mapping) else None
+
+    return get_extra
 
 
-def _get_context_attribute(context: AccessContext, attribute: str) -> Sequence[str] | str | None:
-    if hasattr(context, attribute):
-        return getattr(context, attribute)
-    return context.attributes.get(attribute) if isinstance(context.attributes, Mapping) else None
+def _has_value(value: Sequence[str] | str | None) -> bool:
+    # A plain string counts as one value, even when empty.
+    return value is not None and (isinstance(value, str) or len(value) > 0)
 
 
-def _coerce_to_set(value: Sequence[str] | str | None) -> set[str]:
+def _as_iterable(value: Sequence[str] | str | None) -> Iterable[str]:
     if value is None:
-        return set()
+        return ()
     if isinstance(value, str):
-        return {value}
-    return set(value)
+        return (value,)
+    return value
+
+
+def _as_set(value: Sequence[str] | str | None) -> Set[str] | frozenset[str]:
+    if isinstance(value, (set, frozenset)):
+        return value
+    return set(_as_iterable(value))
+
+
+def _freeze_value(value: Sequence[str] | str | None) -> Hashable:
+    if value is None or isinstance(value, (str, frozenset)):
+        return value
+    if isinstance(value, set):
+        return frozenset(value)
+    return tuple(value)
 
 
 # Backwards-compatible helper utilities ------------------------------------
@@ -307,64 +545,57 @@ def can_edit_object(
 
 policy_engine = AccessPolicyEngine()
 
-policy_engine.register_role(
-    RoleDefinition(
-        name="global_admin",
-        permissions=frozenset(
-            {
-                "workflow:create",
-                "workflow:edit",
-                "workflow:approve",
-                "workflow:view",
-                "workflow:submit",
-                "workflow:return",
-                "workflow:review",
-                "workflow:reopen",
-                "scim:manage",
-                "roles:assign",
-            }
+policy_engine.register_roles(
+    (
+        RoleDefinition(
+            name="global_admin",
+            permissions=frozenset(
+                {
+                    "workflow:create",
+                    "workflow:edit",
+                    "workflow:approve",
+                    "workflow:view",
+                    "workflow:submit",
+                    "workflow:return",
+                    "workflow:review",
+                    "workflow:reopen",
+                    "scim:manage",
+                    "roles:assign",
+                }
+            ),
+            conditions=(),
         ),
-        conditions=(),
-    )
-)
-
-policy_engine.register_role(
-    RoleDefinition(
-        name="workspace_owner",
-        permissions=frozenset({"workflow:view", "workflow:edit", "workflow:submit"}),
-        conditions=(
-            AttributeCondition(
-                attribute="workspace_ids",
-                operator=ConditionOperator.MATCH_RESOURCE,
-                resource_attribute="workspace_ids",
+        RoleDefinition(
+            name="workspace_owner",
+            permissions=frozenset({"workflow:view", "workflow:edit", "workflow:submit"}),
+            conditions=(
+                AttributeCondition(
+                    attribute="workspace_ids",
+                    operator=ConditionOperator.MATCH_RESOURCE,
+                    resource_attribute="workspace_ids",
+                ),
             ),
         ),
-    )
-)
-
-policy_engine.register_role(
-    RoleDefinition(
-        name="okr_expert",
-        permissions=frozenset({"workflow:view", "workflow:review", "workflow:return"}),
-        conditions=(
-            AttributeCondition(
-                attribute="labels",
-                operator=ConditionOperator.CONTAINS,
-                values=frozenset({"okr-expert"}),
+        RoleDefinition(
+            name="okr_expert",
+            permissions=frozenset({"workflow:view", "workflow:review", "workflow:return"}),
+            conditions=(
+                AttributeCondition(
+                    attribute="labels",
+                    operator=ConditionOperator.CONTAINS,
+                    values=frozenset({"okr-expert"}),
+                ),
             ),
         ),
-    )
-)
-
-policy_engine.register_role(
-    RoleDefinition(
-        name="manager",
-        permissions=frozenset({"workflow:view", "workflow:approve", "workflow:return"}),
-        conditions=(
-            AttributeCondition(
-                attribute="manager_of",
-                operator=ConditionOperator.MATCH_RESOURCE,
-                resource_attribute="owner_id",
+        RoleDefinition(
+            name="manager",
+            permissions=frozenset({"workflow:view", "workflow:approve", "workflow:return"}),
+            conditions=(
+                AttributeCondition(
+                    attribute="manager_of",
+                    operator=ConditionOperator.MATCH_RESOURCE,
+                    resource_attribute="owner_id",
+                ),
             ),
         ),
     )
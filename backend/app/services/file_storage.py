@@ -1,7 +1,16 @@
 """Local file storage service for attachments and exports."""
 from __future__ import annotations
 
+import errno
 import hashlib
+import io
+import mmap
+import os
+import stat
+import sys
+import tempfile
+import threading
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 from typing import BinaryIO, Iterable
@@ -9,86 +18,205 @@ from uuid import uuid4
 
 from ..core.config import get_settings
 
+# Read size for streamed uploads.
+CHUNK_SIZE = 1 << 20
 
-@dataclass(frozen=True)
+# Largest single sendfile() call; the kernel caps transfers near 2 GiB anyway.
+SENDFILE_CHUNK_SIZE = 1 << 30
+
+# File-to-file sendfile() is only reliable on Linux (same gate as shutil).
+_HAS_FILE_SENDFILE = sys.platform.startswith("linux")
+
+@dataclass(frozen=True, slots=True)
 class StoredFile:
     """Metadata describing a stored file."""
 
     relative_path: str
     original_name: str
     size: int
-    checksum: str
+    checksum: bytes
 
 
 class LocalFileStorage:
     """Persist files on the application server filesystem."""
 
-    def __init__(self, base_path: Path | None = None) -> None:
+    def __init__(self, base_path: Path | None = None, *, follow_symlinks: bool = False) -> None:
         settings = get_settings()
         self._base_path = (base_path or settings.storage_root).resolve()
         self._base_path.mkdir(parents=True, exist_ok=True)
+        self._base_path_str = str(self._base_path)
+        # Joining "" adds exactly one trailing separator, even for "/".
+        self._base_prefix = os.path.join(self._base_path_str, "")
+        self._follow_symlinks = follow_symlinks
+        # Files this process stored under each directory (whole subtree), so
+        # delete only attempts rmdir on directories that actually emptied.
+        # Only paths in ``_tracked_files`` count; files from before a restart
+        # never touch the counts.
+        self._dir_counts: Counter[str] = Counter()
+        self._tracked_files: set[str] = set()
+        self._dir_lock = threading.Lock()
 
     @property
     def base_path(self) -> Path:
         return self._base_path
 
-    def _resolve(self, relative_path: Path) -> Path:
-        full_path = (self._base_path / relative_path).resolve()
-        if self._base_path not in full_path.parents and full_path != self._base_path:
-            raise ValueError("Attempted path traversal outside of storage root")
-        return full_path
+    def _resolve(self, relative_path: str | Path) -> Path:
+        """Map ``relative_path`` into the storage root, rejecting escapes.
 
-    def _write_bytes(self, data: bytes, destination: Path) -> None:
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        with destination.open("wb") as file_obj:
-            file_obj.write(data)
+        The check is lexical (``normpath``) and needs no syscalls; only with
+        ``follow_symlinks`` is the path resolved on disk, for roots that may
+        contain links pointing elsewhere.
+        """
 
-    def _hash_bytes(self, data: bytes) -> str:
-        digest = hashlib.sha256()
-        digest.update(data)
-        return digest.hexdigest()
+        if self._follow_symlinks:
+            candidate = os.path.realpath(os.path.join(self._base_path_str, relative_path))
+        else:
+            candidate = os.path.normpath(os.path.join(self._base_path_str, relative_path))
+        if candidate != self._base_path_str and not candidate.startswith(self._base_prefix):
+            raise ValueError("Attempted path traversal outside of storage root")
+        return Path(candidate)
 
-    def save_bytes(self, data: bytes, *, original_name: str, subdirs: Iterable[str] | None = None) -> StoredFile:
+    def _hash_bytes(self, data: bytes) -> bytes:
+        return hashlib.sha256(data).digest()
+
+    def _allocate(self, original_name: str, subdirs: Iterable[str] | None) -> tuple[Path, Path]:
         identifier = uuid4().hex
         extension = Path(original_name).suffix
         relative_dir = Path()
         for part in subdirs or []:
             relative_dir /= Path(part)
         relative_dir /= identifier[:2]
-        filename = f"{identifier}{extension}"
-        relative_path = relative_dir / filename
+        relative_path = relative_dir / f"{identifier}{extension}"
         destination = self._resolve(relative_path)
+        # Counted before mkdir so a concurrent delete cannot remove the directory.
+        self._track(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        return relative_path, destination
+
+    def save_bytes(self, data: bytes, *, original_name: str, subdirs: Iterable[str] | None = None) -> StoredFile:
+        relative_path, destination = self._allocate(original_name, subdirs)
         checksum = self._hash_bytes(data)
-        self._write_bytes(data, destination)
+        try:
+            destination.write_bytes(data)
+        except BaseException:
+            destination.unlink(missing_ok=True)
+            self._release(destination)
+            raise
         return StoredFile(relative_path=str(relative_path), original_name=original_name, size=len(data), checksum=checksum)
 
     def save_fileobj(self, file_obj: BinaryIO, *, original_name: str, subdirs: Iterable[str] | None = None) -> StoredFile:
-        data = file_obj.read()
-        return self.save_bytes(data, original_name=original_name, subdirs=subdirs)
+        """Copy ``file_obj`` to storage from its current position.
+
+        Uploads backed by a real file (e.g. a rolled-over spooled upload) are
+        hashed through ``mmap`` and copied with ``sendfile`` so the data never
+        passes through Python buffers; anything else is streamed in chunks.
+        The upload is never held in memory as a whole.
+        """
+
+        relative_path, destination = self._allocate(original_name, subdirs)
+        try:
+            src_fd = _backing_fd(file_obj)
+            if src_fd is not None:
+                size, checksum = self._copy_from_fd(file_obj, src_fd, destination)
+            else:
+                size, checksum = self._copy_chunks(file_obj, destination)
+        except BaseException:
+            destination.unlink(missing_ok=True)
+            self._release(destination)
+            raise
+        return StoredFile(relative_path=str(relative_path), original_name=original_name, size=size, checksum=checksum)
+
+    def _copy_chunks(self, file_obj: BinaryIO, destination: Path) -> tuple[int, bytes]:
+        digest = hashlib.sha256()
+        with destination.open("wb") as out:
+            while chunk := file_obj.read(CHUNK_SIZE):
+                digest.update(chunk)
+                out.write(chunk)
+            return out.tell(), digest.digest()
+
+    def _copy_from_fd(self, file_obj: BinaryIO, src_fd: int, destination: Path) -> tuple[int, bytes]:
+        start = file_obj.tell()
+        end = max(os.fstat(src_fd).st_size, start)
+        digest = hashlib.sha256()
+        if end > start:
+            with mmap.mmap(src_fd, 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped)[start:end] as view:
+                    digest.update(view)
+
+        with destination.open("wb") as out:
+            out_fd = out.fileno()
+            offset = start
+            while offset < end:
+                try:
+                    sent = os.sendfile(out_fd, src_fd, offset, min(end - offset, SENDFILE_CHUNK_SIZE))
+                except OSError as exc:
+                    # Some filesystems reject sendfile(); nothing was copied yet.
+                    if offset == start and exc.errno in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                        out.close()
+                        file_obj.seek(start)
+                        return self._copy_chunks(file_obj, destination)
+                    raise
+                if sent == 0:
+                    break
+                offset += sent
+        file_obj.seek(offset)
+        return offset - start, digest.digest()
 
     def open(self, relative_path: str, mode: str = "rb") -> BinaryIO:
-        path = self._resolve(Path(relative_path))
+        path = self._resolve(relative_path)
         return path.open(mode)
 
     def delete(self, relative_path: str) -> None:
-        path = self._resolve(Path(relative_path))
+        path = self._resolve(relative_path)
         try:
             path.unlink()
         except FileNotFoundError:
             return
-        self._cleanup_empty_parents(path.parent)
+        self._release(path)
 
     def exists(self, relative_path: str) -> bool:
-        path = self._resolve(Path(relative_path))
+        path = self._resolve(relative_path)
         return path.exists()
 
     def get_absolute_path(self, relative_path: str) -> Path:
         """Return the full filesystem path for the stored file."""
 
-        return self._resolve(Path(relative_path))
+        return self._resolve(relative_path)
+
+    def _track(self, path: Path) -> None:
+        directory = str(path.parent)
+        with self._dir_lock:
+            self._tracked_files.add(str(path))
+            while directory != self._base_path_str:
+                self._dir_counts[directory] += 1
+                directory = os.path.dirname(directory)
+
+    def _release(self, path: Path) -> None:
+        current = str(path.parent)
+        with self._dir_lock:
+            if str(path) not in self._tracked_files:
+                # Stored before this process started; probe the old way.
+                self._cleanup_empty_parents(path.parent)
+                return
+            self._tracked_files.discard(str(path))
+            while current != self._base_path_str:
+                remaining = self._dir_counts[current] - 1
+                if remaining > 0:
+                    self._dir_counts[current] = remaining
+                else:
+                    del self._dir_counts[current]
+                    try:
+                        os.rmdir(current)
+                    except OSError:
+                        # Holds files from before a restart; stop tracking it.
+                        pass
+                current = os.path.dirname(current)
 
     def _cleanup_empty_parents(self, directory: Path) -> None:
         while directory != self._base_path:
+            if str(directory) in self._dir_counts:
+                # Holds (or is about to hold) files this process stored.
+                break
             try:
                 directory.rmdir()
             except OSError:
@@ -96,4 +224,27 @@ class LocalFileStorage:
             directory = directory.parent
 
 
+def _backing_fd(file_obj: BinaryIO) -> int | None:
+    """Return the descriptor of an on-disk upload, or ``None`` to stream it."""
+
+    if not _HAS_FILE_SENDFILE:
+        return None
+    if isinstance(file_obj, tempfile.SpooledTemporaryFile):
+        # A spool still in memory has no name; fileno() would force it to
+        # roll over to disk, so stream it instead.
+        if file_obj.name is None:
+            return None
+    elif not isinstance(file_obj, (io.BufferedReader, io.BufferedRandom, io.FileIO)):
+        return None
+    try:
+        file_obj.flush()
+        fd = file_obj.fileno()
+        # Pipes and sockets can be neither mapped nor sent from at an offset.
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+    except (OSError, ValueError):
+        return None
+    return fd
+
+
 __all__ = ["LocalFileStorage", "StoredFile"]
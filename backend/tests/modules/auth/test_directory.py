@@ -37,7 +37,7 @@ def test_directory_user_lifecycle_roundtrip():
         ],
     )
 
-    updated = directory.patch_user(user.id, [op.model_dump(exclude_none=True) for op in patch_request.Operations])
+    updated = directory.patch_user(user.id, patch_request.Operations)
     assert updated is not None
     assert updated.displayName == "Jane Smith"
 
@@ -75,3 +75,31 @@ def test_directory_group_membership_management():
     assert all(m.value != "user-1" for m in cleaned.members)
 
     assert directory.delete_group(group.id) is True
+
+
+def test_directory_lookup_rebuilds_after_unpublished_member_change():
+    directory = InMemoryDirectory()
+    group = directory.create_group(SCIMGroupCreateRequest(displayName="Ops", members=[]))
+
+    directory.add_member_to_group(
+        group.id, SCIMGroupMember(value="user-1"), return_representation=False
+    )
+    fetched = directory.get_group(group.id)
+
+    assert fetched is not group
+    assert [m.value for m in fetched.members] == ["user-1"]
+    assert directory.get_group(group.id) is fetched
+
+
+def test_directory_finds_users_by_username_case_insensitively():
+    directory = InMemoryDirectory()
+    user = directory.create_user(SCIMUserCreateRequest(userName="Jane.Doe"))
+    directory.create_user(SCIMUserCreateRequest(userName="john.doe"))
+
+    assert [u.id for u in directory.find_users_by_username("jane.doe")] == [user.id]
+
+    directory.replace_user(user.id, SCIMUserCreateRequest(userName="jane.roe"))
+    assert directory.find_users_by_username("jane.doe") == []
+
+    directory.delete_user(user.id)
+    assert directory.find_users_by_username("jane.roe") == []
@@ -0,0 +1,75 @@
+import logging
+import os
+from contextlib import contextmanager
+
+import pytest
+
+from app.modules.data_connectors.journal import JournalSink
+
+
+class RecordingSessions:
+    """Session factory collecting the rows of every INSERT batch."""
+
+    def __init__(self, fail_first: bool = False) -> None:
+        self.batches: list[list[dict]] = []
+        self._fail = fail_first
+
+    @contextmanager
+    def __call__(self):
+        yield self
+
+    def execute(self, _statement, rows):
+        if self._fail:
+            self._fail = False
+            raise RuntimeError("database unavailable")
+        self.batches.append([row["id"] for row in rows])
+
+
+def test_sink_batches_rows_and_flushes_on_close():
+    sessions = RecordingSessions()
+    sink = JournalSink(sessions, max_batch=2, flush_interval=1.0)
+
+    for row_id in range(5):
+        sink.submit({"id": row_id})
+    sink.close()
+
+    assert sessions.batches == [[0, 1], [2, 3], [4]]
+
+
+def test_sink_drops_failed_batch_and_keeps_writing(caplog):
+    sessions = RecordingSessions(fail_first=True)
+    sink = JournalSink(sessions, max_batch=1, flush_interval=1.0)
+
+    with caplog.at_level(logging.ERROR):
+        sink.submit({"id": "lost"})
+        sink.submit({"id": "kept"})
+        sink.close()
+
+    assert sessions.batches == [["kept"]]
+    assert "Dropped 1 data selection log rows" in caplog.text
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_sink_starts_its_own_writer_after_fork():
+    sessions = RecordingSessions()
+    sink = JournalSink(sessions, flush_interval=0.01)
+    sink.submit({"id": "parent"})
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        try:
+            sink.submit({"id": "child"})
+            sink.close()
+            os.write(write_fd, repr(sessions.batches).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as pipe:
+        child_batches = pipe.read()
+    os.waitpid(pid, 0)
+    sink.close()
+
+    assert child_batches.endswith("['child']]")
+    assert "'child'" not in repr(sessions.batches)
+    assert ["parent"] in sessions.batches
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+
+from app.modules.data_connectors.journal import DataSelectionJournal
+from app.modules.data_connectors.ms_graph_excel import MicrosoftGraphExcelConnector
+
+URL = "https://graph.test/rows"
+
+
+class FakeGraph:
+    """Serves ``rows`` through $top/$skip, returning at most ``cap`` per page."""
+
+    def __init__(
+        self, total: int, *, cap: int | None = None, count: str | None = None, count_status: int = 200
+    ):
+        self.rows = list(range(total))
+        self.cap = cap
+        self.count = str(total) if count is None else count
+        self.count_status = count_status
+        self.count_requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/$count"):
+            self.count_requests += 1
+            return httpx.Response(self.count_status, text=self.count)
+        top = int(request.url.params["$top"])
+        skip = int(request.url.params["$skip"])
+        if self.cap is not None:
+            top = min(top, self.cap)
+        return httpx.Response(200, json={"value": self.rows[skip : skip + top]})
+
+
+def _connector(graph: FakeGraph) -> MicrosoftGraphExcelConnector:
+    return MicrosoftGraphExcelConnector(
+        token_provider=lambda: "token",
+        base_url="https://graph.test",
+        journal=DataSelectionJournal(session_factory=lambda: None),
+        http_client=httpx.Client(transport=httpx.MockTransport(graph)),
+    )
+
+
+@pytest.mark.parametrize("page_size", [5, 10, 100])
+def test_short_page_mid_range_does_not_drop_rows(page_size):
+    graph = FakeGraph(53, cap=7)
+
+    rows = _connector(graph)._get_paged_rows(URL, "token", {}, page_size)
+
+    assert rows == graph.rows
+
+
+@pytest.mark.parametrize(
+    "count, count_status", [("", 500), ("not a number", 200), ("-1", 200)]
+)
+def test_unusable_count_falls_back_to_sequential_paging(count, count_status):
+    graph = FakeGraph(23, count=count, count_status=count_status)
+
+    rows = _connector(graph)._get_paged_rows(URL, "token", {}, 5)
+
+    assert rows == graph.rows
+
+
+def test_filtered_read_skips_count():
+    graph = FakeGraph(12)
+
+    rows = _connector(graph)._get_paged_rows(URL, "token", {"$filter": "x eq 1"}, 5)
+
+    assert rows == graph.rows
+    assert graph.count_requests == 0
+
+
+def test_empty_table():
+    graph = FakeGraph(0)
+
+    assert _connector(graph)._get_paged_rows(URL, "token", {}, 5) == []
@@ -0,0 +1,36 @@
+import sys
+import threading
+
+from app.modules.workflow.schemas import WorkflowInstanceModel
+from app.modules.workflow.service import WorkflowInstance, WorkflowState
+
+
+def test_history_reads_do_not_race_transitions():
+    instance = WorkflowInstance(
+        id="wf-1",
+        objective_id="obj-1",
+        owner_id="user-1",
+        tenant_id="tenant-1",
+        workspace_ids=["ws-1"],
+    )
+    for _ in range(100):
+        instance.add_history("workflow:submit", "user-1", WorkflowState.REVIEW, None)
+
+    stop = threading.Event()
+
+    def write() -> None:
+        while not stop.is_set():
+            instance.add_history("workflow:submit", "user-1", WorkflowState.REVIEW, None)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        for _ in range(2000):
+            model = WorkflowInstanceModel.from_domain(instance)
+            assert len(model.history) == 100
+    finally:
+        stop.set()
+        writer.join()
+        sys.setswitchinterval(interval)
@@ -1,6 +1,11 @@
 from datetime import datetime, timezone
+from typing import get_args
 
-from app.modules.workflow.schemas import WorkflowHistoryEntryModel, WorkflowInstanceModel
+from app.modules.workflow.schemas import (
+    WorkflowHistoryEntryModel,
+    WorkflowInstanceModel,
+    WorkflowStateValue,
+)
 from app.modules.workflow.service import WorkflowHistoryEntry, WorkflowInstance, WorkflowState
 
 
@@ -43,3 +48,46 @@ def test_workflow_history_entry_model_from_domain():
     assert model.resulting_state == WorkflowState.ACTIVE
     assert model.comment == "approved"
     assert model.actor_id == "manager-1"
+
+
+def test_workflow_instance_model_from_domain_matches_validated_model():
+    instance = WorkflowInstance(
+        id="wf-2",
+        objective_id="obj-2",
+        owner_id="user-1",
+        tenant_id="tenant-1",
+        workspace_ids=["ws-2", "ws-1"],
+    )
+    instance.add_history("workflow:create", "user-1", WorkflowState.DRAFT, None)
+    instance.add_history("workflow:submit", "user-1", WorkflowState.REVIEW, "ready")
+
+    model = WorkflowInstanceModel.from_domain(instance)
+    validated = WorkflowInstanceModel.model_validate(model.model_dump())
+
+    assert model.workspace_ids == ["ws-1", "ws-2"]
+    assert model.model_dump_json() == validated.model_dump_json()
+
+
+def test_workflow_state_literal_matches_enum():
+    assert set(get_args(WorkflowStateValue)) == {state.value for state in WorkflowState}
+
+
+def test_cached_instance_body_matches_its_version():
+    from app.modules.workflow.router import _serialize_instance, _VersionedInstance
+
+    instance = WorkflowInstance(
+        id="wf-3",
+        objective_id="obj-3",
+        owner_id="user-1",
+        tenant_id="tenant-1",
+        workspace_ids=["ws-1"],
+    )
+    instance.add_history("workflow:create", "user-1", WorkflowState.DRAFT, None)
+    entry = _VersionedInstance.of(instance)
+    # A transition lands between taking the ETag and building the body.
+    instance.add_history("workflow:submit", "user-1", WorkflowState.REVIEW, None)
+
+    body = WorkflowInstanceModel.model_validate_json(_serialize_instance(entry))
+
+    assert entry.etag == 'W/"wf-3:1"'
+    assert [item.action for item in body.history] == ["workflow:create"]
@@ -0,0 +1,82 @@
+from app.services.access_policies import (
+    AccessContext,
+    AccessDecision,
+    AccessPolicyEngine,
+    AttributeCondition,
+    ConditionOperator,
+    RoleDefinition,
+)
+
+
+def _context(**overrides) -> AccessContext:
+    return AccessContext(user_id="user-1", tenant_id="tenant-1", **overrides)
+
+
+def _decision(engine: AccessPolicyEngine, action: str, context: AccessContext, resource=None):
+    return engine.is_action_allowed("user-1", action, context, resource_attributes=resource)[0]
+
+
+def test_role_changes_invalidate_permission_memo():
+    engine = AccessPolicyEngine()
+    engine.register_role(RoleDefinition(name="reader", permissions=frozenset({"okr:view"})))
+    context = _context()
+
+    assert _decision(engine, "okr:view", context) is AccessDecision.DENY
+
+    engine.assign_role("user-1", "reader")
+    assert _decision(engine, "okr:view", context) is AccessDecision.ALLOW
+
+    engine.register_role(RoleDefinition(name="reader", permissions=frozenset({"okr:edit"})))
+    assert _decision(engine, "okr:view", context) is AccessDecision.DENY
+    assert _decision(engine, "okr:edit", context) is AccessDecision.ALLOW
+
+    engine.revoke_role("user-1", "reader")
+    assert _decision(engine, "okr:edit", context) is AccessDecision.DENY
+
+
+def test_context_attributes_are_copied_at_construction():
+    attributes = {"region": ["eu"]}
+    context = _context(attributes=attributes)
+
+    attributes["region"].append("us")
+    attributes["level"] = "lead"
+
+    assert dict(context.attributes) == {"region": ("eu",)}
+
+
+def test_memo_ignores_resource_attributes_no_condition_reads():
+    engine = AccessPolicyEngine()
+    engine.register_role(
+        RoleDefinition(
+            name="workspace-editor",
+            permissions=frozenset({"okr:edit"}),
+            conditions=(
+                AttributeCondition(
+                    attribute="workspace_ids",
+                    operator=ConditionOperator.MATCH_RESOURCE,
+                    resource_attribute="workspace_ids",
+                ),
+            ),
+        )
+    )
+    engine.assign_role("user-1", "workspace-editor")
+    context = _context(workspace_ids=frozenset({"ws-1"}))
+
+    for object_id in ("obj-1", "obj-2", "obj-3"):
+        resource = {"id": object_id, "workspace_ids": frozenset({"ws-1"})}
+        assert _decision(engine, "okr:edit", context, resource) is AccessDecision.ALLOW
+    assert len(engine._permission_cache) == 1
+
+    other = {"id": "obj-4", "workspace_ids": frozenset({"ws-2"})}
+    assert _decision(engine, "okr:edit", context, other) is AccessDecision.DENY
+
+
+def test_context_coerces_set_fields_for_compiled_conditions():
+    condition = AttributeCondition(
+        attribute="labels", operator=ConditionOperator.CONTAINS, values=frozenset({"finance"})
+    )
+
+    for labels in ({"finance"}, ["finance", "hr"], "finance"):
+        context = _context(labels=labels)
+        assert isinstance(context.labels, frozenset)
+        assert condition.evaluate(context) is True
@@ -0,0 +1,114 @@
+import errno
+import hashlib
+import io
+import os
+import tempfile
+
+import pytest
+
+from app.services import file_storage
+from app.services.file_storage import LocalFileStorage
+
+PAYLOAD = os.urandom(300_000)
+START = 1_000
+
+
+def _rolled_spool(_tmp_path):
+    spool = tempfile.SpooledTemporaryFile(max_size=1024)
+    spool.write(PAYLOAD)
+    assert spool.name is not None
+    return spool
+
+
+def _unrolled_spool(_tmp_path):
+    spool = tempfile.SpooledTemporaryFile(max_size=len(PAYLOAD) * 2)
+    spool.write(PAYLOAD)
+    return spool
+
+
+def _bytes_io(_tmp_path):
+    return io.BytesIO(PAYLOAD)
+
+
+def _real_file(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(PAYLOAD)
+    return path.open("rb")
+
+
+SOURCES = {
+    "rolled_spool": (_rolled_spool, True),
+    "unrolled_spool": (_unrolled_spool, False),
+    "bytes_io": (_bytes_io, False),
+    "real_file": (_real_file, True),
+}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalFileStorage(tmp_path / "storage")
+
+
+@pytest.fixture
+def copy_paths(monkeypatch):
+    used = []
+    original = LocalFileStorage._copy_from_fd
+
+    def spy(self, *args):
+        used.append("fd")
+        return original(self, *args)
+
+    monkeypatch.setattr(LocalFileStorage, "_copy_from_fd", spy)
+    return used
+
+
+@pytest.mark.parametrize("source", sorted(SOURCES))
+def test_save_fileobj_stores_identical_bytes(tmp_path, storage, copy_paths, source):
+    factory, uses_fd = SOURCES[source]
+    with factory(tmp_path) as file_obj:
+        file_obj.seek(START)
+        stored = storage.save_fileobj(file_obj, original_name="upload.bin")
+        assert file_obj.tell() == len(PAYLOAD)
+        if source == "unrolled_spool":
+            assert file_obj.name is None
+
+    expected = PAYLOAD[START:]
+    assert storage.get_absolute_path(stored.relative_path).read_bytes() == expected
+    assert stored.size == len(expected)
+    assert stored.checksum == hashlib.sha256(expected).digest()
+    assert copy_paths == (["fd"] if uses_fd and file_storage._HAS_FILE_SENDFILE else [])
+
+
+@pytest.mark.skipif(not file_storage._HAS_FILE_SENDFILE, reason="sendfile path is Linux only")
+def test_sendfile_einval_falls_back_to_chunks(tmp_path, storage, monkeypatch):
+    def reject(*_args):
+        raise OSError(errno.EINVAL, "sendfile not supported")
+
+    monkeypatch.setattr(file_storage.os, "sendfile", reject)
+    with _real_file(tmp_path) as file_obj:
+        file_obj.seek(START)
+        stored = storage.save_fileobj(file_obj, original_name="upload.bin")
+
+    expected = PAYLOAD[START:]
+    assert storage.get_absolute_path(stored.relative_path).read_bytes() == expected
+    assert stored.checksum == hashlib.sha256(expected).digest()
+
+
+def test_deleting_untracked_file_keeps_directory_counts(storage):
+    stored = storage.save_bytes(b"new", original_name="new.txt", subdirs=["kr-1"])
+    directory = storage.get_absolute_path(stored.relative_path).parent
+    # A file stored before a restart, in a directory this process also uses.
+    legacy = directory / "legacy.txt"
+    legacy.write_bytes(b"old")
+    legacy_relative = legacy.relative_to(storage.base_path).as_posix()
+
+    storage.delete(legacy_relative)
+
+    assert storage._dir_counts[str(directory)] == 1
+    assert storage._dir_counts[str(directory.parent)] == 1
+    assert directory.is_dir()
+
+    storage.delete(stored.relative_path)
+
+    assert not storage._dir_counts
+    assert not directory.parent.exists()